@@ -8,7 +8,9 @@ setup(
     author_email='ryan@eventmobi.com',
     url='https://github.com/EventMobi/thorium',
     packages=['thorium', 'thorium.ext'],
+    python_requires='>=3.7',
     install_requires=['Flask==0.10.1', 'jsonschema==2.4.0', 'arrow==0.5.4'],
+    extras_require={'orjson': ['orjson'], 'numpy': ['numpy'], 'brotli': ['Brotli']},
     license='BSD',
     classifiers=[
         'Framework :: Flask',
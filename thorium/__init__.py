@@ -3,9 +3,11 @@ from .thorium import Thorium
 
 from .datastructures import NotSet
 
-from .resources import Resource
+from .resources import Resource, ResourceCollection
 
-from .endpoint import Endpoint
+from .endpoint import Endpoint, AsyncEndpoint
+
+from .cache import ResponseCache, LocalResponseCache
 
 from .parameters import Parameters
 
@@ -15,5 +17,9 @@ from .request import Request
 
 from .thoriumflask import ThoriumFlask
 
+from .thoriumasgi import ThoriumASGI
+
+from .thoriumwsgi import ThoriumWSGI
+
 from . import fields
 
@@ -1,4 +1,5 @@
 from . import errors
+from .endpoint import maybe_await
 
 
 def use(*authenticator_classes):
@@ -134,4 +135,40 @@ class Authenticator(object, metaclass=AuthenticatorMetaClass):
         where the method being validated has the :function:`no_auth` decorator. Override to
         provide the default authorization check. A False return will throw an access denied
         error. """
-        raise NotImplementedError('No authorization found.')
\ No newline at end of file
+        raise NotImplementedError('No authorization found.')
+
+
+class AsyncAuthenticator(Authenticator):
+    """ An :class:`Authenticator` for use with an :class:`.AsyncEndpoint`. Any of
+    :function:`_load`, :function:`_authenticate`, :function:`_authorize` and the
+    validation methods may be coroutines, they are awaited by :function:`check_auth`.
+    """
+
+    async def check_auth(self, method):
+        """ Finds and executes all validation rules for the given method.
+
+        :param method: A reference to a class method to run validation on.
+        """
+        self.method = method.__func__
+        if self.method not in self._no_auth_methods:
+            await self.try_load()
+            if not await maybe_await(self._authenticate()):
+                raise errors.UnauthorizedError()
+
+            if not await maybe_await(self._authorize()):
+                raise errors.ForbiddenError()
+
+        if self.method in self._validators:
+            await self.try_load()
+            for v in self._validators[self.method]:
+                if not await maybe_await(v(self)):
+                    raise errors.ForbiddenError()
+
+        return True
+
+    async def try_load(self):
+        """ Call the :function:`load` subclass hook if it hasn't not already been called. """
+        if not self._loaded:
+            await maybe_await(self._load())
+            self._loaded = True
+
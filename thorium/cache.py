@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+    thorium.cache
+    ~~~~~~~~~~~~~
+
+    Caches of serialized GET responses, used by endpoints which set
+    ``response_cache``.
+
+"""
+
+import threading
+import time
+import uuid
+
+from collections import OrderedDict
+
+
+class ResponseCache(object):
+    """
+    Stores serialized responses as ``(status_code, headers, body)`` tuples
+    under string keys. Subclasses for an external store, such as memcached or
+    redis, implement :meth:`get` and :meth:`set`.
+
+    Keys are grouped in namespaces, each holding a generation which is part of
+    every key in it. :meth:`invalidate` replaces the generation, so all
+    responses cached in the namespace are missed and left to expire, without
+    the store having to find or delete them.
+    """
+
+    def get(self, key):
+        """ Returns the value stored for a key, or None. """
+        raise NotImplementedError()
+
+    def set(self, key, value, ttl=None):
+        """
+        :param key: A string key
+        :param value: The value to store
+        :param ttl: Seconds until the value expires, None to keep it until
+            it is evicted
+        """
+        raise NotImplementedError()
+
+    def key(self, namespace, key):
+        """
+        Returns the store key for a key of a namespace. A key is resolved once
+        per request, so a response computed while its namespace is
+        invalidated is stored under the old generation and never served.
+        """
+        generation_key = 'thorium:generation:' + namespace
+        generation = self.get(generation_key)
+        if generation is None:
+            generation = uuid.uuid4().hex
+            self.set(generation_key, generation)
+        return 'thorium:{0}:{1}:{2}'.format(namespace, generation, key)
+
+    def invalidate(self, namespace):
+        """ Discards every response cached in a namespace. """
+        self.set('thorium:generation:' + namespace, uuid.uuid4().hex)
+
+
+class LocalResponseCache(ResponseCache):
+    """
+    An in process, thread safe :class:`ResponseCache` which evicts the least
+    recently used entries beyond ``maxsize``. Each process of a server keeps
+    its own cache, so invalidation only reaches the process handling the
+    write, use an external store for servers with several processes.
+
+    :param maxsize: The maximum number of entries kept
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+    thorium.compression
+    ~~~~~~~~~~~~~~~~~~~
+
+    Content-Encoding negotiation and gzip or brotli compression of serialized
+    response bodies, both whole and streamed.
+
+"""
+
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# zlib window bits producing the gzip format
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+# statuses which never have a body to compress
+NO_BODY_STATUSES = frozenset((204, 304))
+
+
+def negotiate_encoding(accept_encoding):
+    """
+    Returns the content coding to use for an Accept-Encoding header, ``br``
+    when brotli is installed and accepted, otherwise ``gzip``, or None when
+    neither is accepted. Codings with the higher quality value are preferred.
+    """
+    if not accept_encoding:
+        return None
+    qualities = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding.strip().lower()] = quality
+
+    wildcard = qualities.get('*', 0.0)
+    best, best_quality = None, 0.0
+    for coding in (('br', 'gzip') if brotli is not None else ('gzip',)):
+        quality = qualities.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class Compressor(object):
+    """
+    Compresses serialized response bodies.
+
+    :param min_size: Bodies smaller than this many bytes are sent as is.
+        Streamed bodies are always compressed, their size is not known
+        before they are sent.
+    :param level: The gzip compression level, from 1 to 9
+    :param brotli_quality: The brotli quality, from 0 to 11
+    """
+
+    def __init__(self, min_size=1024, level=6, brotli_quality=5):
+        self.min_size = min_size
+        self.level = level
+        self.brotli_quality = brotli_quality
+
+    def compress_response(self, body, headers, encoding, status_code=200):
+        """
+        Compresses a serialized body, either a string or an iterator of byte
+        chunks, with a coding from :func:`negotiate_encoding`. Empty bodies
+        and 204 or 304 responses are left as they are.
+
+        The ETag is weakened whenever a coding was negotiated, compressed or
+        not, so a 304 carries the same ETag as the 200 it revalidates.
+
+        :return: A tuple of the body and a copy of the headers with the
+            Content-Encoding, Vary and ETag headers updated
+        """
+        headers = dict(headers)
+        vary = headers.get('Vary')
+        headers['Vary'] = vary + ', Accept-Encoding' if vary else 'Accept-Encoding'
+        if encoding is None:
+            return body, headers
+        # the compressed bytes differ from those the ETag was made for
+        etag = headers.get('ETag')
+        if etag and not etag.startswith('W/'):
+            headers['ETag'] = 'W/' + etag
+        if status_code in NO_BODY_STATUSES:
+            return body, headers
+
+        if isinstance(body, (str, bytes)):
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+            if not body or len(body) < self.min_size:
+                return body, headers
+            body = self.compress(body, encoding)
+        else:
+            body = self.compress_stream(body, encoding)
+
+        headers['Content-Encoding'] = encoding
+        return body, headers
+
+    def compress(self, data, encoding):
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, GZIP_WBITS)
+        return compressor.compress(data) + compressor.flush()
+
+    def compress_stream(self, chunks, encoding):
+        """
+        Compresses an iterator of byte chunks as they are consumed. Empty
+        compressed chunks are not yielded.
+        """
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            compress, finish = compressor.process, compressor.finish
+        else:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, GZIP_WBITS)
+            compress, finish = compressor.compress, compressor.flush
+        for chunk in chunks:
+            compressed = compress(chunk)
+            if compressed:
+                yield compressed
+        yield finish()
@@ -1,7 +1,19 @@
-class NotSet(object):
+class NotSetType(object):
+    """
+    The type of the :data:`NotSet` sentinel. There is only ever one instance,
+    so checks should use ``value is NotSet``. Equality is kept for backwards
+    compatibility but is also identity based, it never converts the compared
+    value to a string.
+    """
 
     def __eq__(self, other):
-        return (str(self) == str(other)) and not other
+        return other is self or isinstance(other, NotSetType)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(NotSetType)
 
     def __bool__(self):
         return False
@@ -12,4 +24,13 @@ class NotSet(object):
     def __repr__(self):
         return 'NotSet'
 
-NotSet = NotSet()
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return 'NotSet'
+
+NotSet = NotSetType()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+    thorium.decoder
+    ~~~~~~~~~~~~~~~
+
+    Decodes json request bodies directly into :class:`.Resource`'s, used by
+    the server adapters for endpoints with ``decode_resources`` set.
+
+"""
+
+from . import errors
+from .serializer import JsonBackend
+
+
+class ResourceDecoder(object):
+    """
+    Decodes a json object, or an array of objects, into resources of a
+    :class:`.Resource` class. Keys which are not fields of the resource are
+    rejected before any value is validated, then all items are cast and
+    validated in one batch by :meth:`.Resource.init_many_from_dicts`. Values
+    are cast since json has no types for dates and times.
+
+    :param resource_cls: The :class:`.Resource` class to decode into
+    :param backend: An optional :class:`.JsonBackend` parsing the body,
+        defaults to the standard library :class:`.JsonBackend`
+    """
+
+    def __init__(self, resource_cls, backend=None):
+        self.resource_cls = resource_cls
+        self.backend = backend or JsonBackend()
+        self._fields = frozenset(resource_cls._fields)
+
+    def decode(self, body, partial=False, identifiers=None):
+        """
+        :param body: The request body as bytes or a string
+        :param partial: True to decode partial resources, as for a PATCH
+        :param identifiers: Url variables overriding the values of fields
+            with the same name
+        :return: A tuple of the resource and the list of resources, only one
+            of which is set depending on whether the body is an object or an
+            array
+        """
+        try:
+            data = self.backend.loads(body) if body and body.strip() else None
+        except ValueError as e:
+            raise errors.ValidationError('Invalid json: {0}'.format(e))
+
+        is_array = isinstance(data, list)
+        if data is None:
+            items = [{}]
+        elif is_array:
+            items = data
+        else:
+            items = [data]
+
+        fields = self._fields
+        for item in items:
+            if not isinstance(item, dict):
+                raise errors.ValidationError(
+                    'Expected a json object or array of objects.')
+            if not fields.issuperset(item):
+                unknown = sorted(set(item) - fields)
+                raise errors.ValidationError('{0} is not a field of {1}.'.format(
+                    ', '.join(unknown), self.resource_cls.__name__))
+
+        if identifiers:
+            identifiers = {k: v for k, v in identifiers.items() if k in fields}
+            for item in items:
+                item.update(identifiers)
+
+        resources = self.resource_cls.init_many_from_dicts(
+            items, partial=partial, cast=True)
+        if is_array:
+            return None, resources
+        return resources[0], []
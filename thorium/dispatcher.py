@@ -1,6 +1,12 @@
 # -*- coding: utf-8 -*-
 
+import asyncio
+import hashlib
+
 from . import errors
+from .decoder import ResourceDecoder
+from .endpoint import Endpoint, AsyncEndpoint, maybe_await
+from .resources import VALID_QUERY_PARAMETERS
 from .response import DetailResponse, CollectionResponse
 from .serializer import JsonSerializer
 
@@ -22,16 +28,165 @@ class DispatcherBase(object):
         self.Resource = resource_cls
         self.Parameters = parameters_cls
         self.allowed_methods = {method.upper() for method in allowed_methods}
+        self.allow_header = ', '.join(sorted(self.allowed_methods))
+        json_backend = getattr(endpoint_cls, 'json_backend', None)
+        self.serializer = JsonSerializer(backend=json_backend)
+        self.decoder = None
+        if getattr(endpoint_cls, 'decode_resources', False):
+            self.decoder = ResourceDecoder(resource_cls, backend=json_backend)
+        self._compile_dispatch()
+
+    def _compile_dispatch(self):
+        """
+        Resolves once per route what ``dispatch`` would otherwise look up on
+        every request: the endpoint function for each allowed method and the
+        lifecycle hooks which are actually overridden by the endpoint.
+        """
+        endpoint_cls = self.Endpoint
+
+        self._dispatch_table = {}
+        if type(self).get_dispatch_method is DispatcherBase.get_dispatch_method:
+            for method in self.allowed_methods:
+                name = '{0}_{1}'.format(method.lower(), self.request_type)
+                function = getattr(endpoint_cls, name, None)
+                if function is not None:
+                    self._dispatch_table[method] = function
+
+        base_cls = Endpoint
+        if isinstance(endpoint_cls, type) and issubclass(endpoint_cls, AsyncEndpoint):
+            base_cls = AsyncEndpoint
+        self._is_async = base_cls is AsyncEndpoint
+
+        def overridden(name):
+            return getattr(endpoint_cls, name) is not getattr(base_cls, name)
+
+        # a dispatcher subclass overriding pre_request is always called
+        dispatcher_hook = type(self).pre_request not in (
+            CollectionDispatcher.pre_request, DetailDispatcher.pre_request)
+        self._pre_request_hooks = tuple(
+            hook for hook, keep in (
+                (endpoint_cls.pre_request, overridden('pre_request')),
+                (self.pre_request, dispatcher_hook or
+                 overridden('pre_request_' + self.request_type)),
+            ) if keep
+        )
+        self._post_request = (endpoint_cls.post_request
+                              if overridden('post_request') else None)
+        # authenticate is a public override point, it is only skipped when
+        # it is the default and there are no authenticators to run
+        self._authenticate_overridden = overridden('authenticate')
+        etag_name = 'etag_' + self.request_type
+        self._etag_hook = (getattr(endpoint_cls, etag_name)
+                           if overridden(etag_name) else None)
+        self._hash_etag = bool(getattr(endpoint_cls, 'etag_response', False))
 
     def dispatch(self, request):
         """
         Injects the :class:`.ResourceInterface` into the :class:`.Endpoint`
         then calls a method on the engine to handle the request based on the
-        :class:`.ThoriumRequest`.
+        :class:`.ThoriumRequest`. An :class:`.AsyncEndpoint` is run to
+        completion on a new event loop, which can't be done from a running
+        event loop, asynchronous servers must use :meth:`dispatch_async`.
+
+        :param request: A :class:`.ThoriumRequest` object
+        """
+        if self._is_async:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(self.dispatch_async(request))
+            raise RuntimeError(
+                'Cannot dispatch {0} from a running event loop, use '
+                'dispatch_async instead.'.format(self.Endpoint.__name__))
+
+        response, engine, dispatch_method = self._prepare(request)
+
+        if self._authenticate_overridden or engine._authenticators:
+            engine.authenticate(dispatch_method)
+
+        # a cached response is served before the pre_request hooks, see
+        # Endpoint.cache_scope
+        cache_key = None
+        if engine.response_cache is not None and request.method == 'GET':
+            cache_key = self._cache_key(engine, engine.cache_scope())
+            cached = self._get_cached(engine, response, cache_key)
+            if cached is not None:
+                return cached
+
+        for hook in self._pre_request_hooks:
+            hook(engine)
+
+        not_modified = False
+        if self._etag_hook is not None and request.method == 'GET':
+            not_modified = self._not_modified(request, response,
+                                              self._etag_hook(engine))
+
+        if not not_modified:
+            # Call into the endpoint
+            method_response = dispatch_method()
+
+            # Override default response
+            if method_response:
+                response = method_response
+
+        if self._post_request is not None:
+            self._post_request(engine)
+
+        if not_modified:
+            return response, ''
+        return response, self._serialize(engine, response, cache_key)
+
+    async def dispatch_async(self, request):
+        """
+        The awaitable equivalent of :meth:`dispatch`. Endpoint methods, hooks
+        and authenticators returning awaitables are awaited, so an
+        :class:`.AsyncEndpoint` can be mixed freely with synchronous code.
+        Endpoints which are not an :class:`.AsyncEndpoint` are dispatched
+        synchronously.
 
         :param request: A :class:`.ThoriumRequest` object
         """
+        if not self._is_async:
+            return self.dispatch(request)
+
+        response, engine, dispatch_method = self._prepare(request)
+
+        if self._authenticate_overridden or engine._authenticators:
+            await maybe_await(engine.authenticate(dispatch_method))
 
+        # a cached response is served before the pre_request hooks, see
+        # Endpoint.cache_scope
+        cache_key = None
+        if engine.response_cache is not None and request.method == 'GET':
+            cache_key = self._cache_key(engine, await maybe_await(engine.cache_scope()))
+            cached = self._get_cached(engine, response, cache_key)
+            if cached is not None:
+                return cached
+
+        for hook in self._pre_request_hooks:
+            await maybe_await(hook(engine))
+
+        not_modified = False
+        if self._etag_hook is not None and request.method == 'GET':
+            not_modified = self._not_modified(
+                request, response, await maybe_await(self._etag_hook(engine)))
+
+        if not not_modified:
+            # Call into the endpoint
+            method_response = await maybe_await(dispatch_method())
+
+            # Override default response
+            if method_response:
+                response = method_response
+
+        if self._post_request is not None:
+            await maybe_await(self._post_request(engine))
+
+        if not_modified:
+            return response, ''
+        return response, self._serialize(engine, response, cache_key)
+
+    def _prepare(self, request):
         # ensure valid method
         if request.method not in self.allowed_methods:
             msg = ('Method {0} not available on {1} {2} resource.'
@@ -39,34 +194,94 @@ class DispatcherBase(object):
                            self.Resource.__name__,
                            self.request_type))
             raise errors.MethodNotAllowedError(
-                message=msg, headers={'Allow': ', '.join(self.allowed_methods)}
+                message=msg, headers={'Allow': self.allow_header}
             )
 
         response = self.build_response_obj(request=request)
 
         engine = self.Endpoint(request=request, response=response)
 
-        dispatch_method = self.get_dispatch_method(engine=engine)
-
-        engine.authenticate(dispatch_method)
-
-        engine.pre_request()
-
-        self.pre_request(engine=engine)
+        function = self._dispatch_table.get(request.method)
+        if function is not None:
+            dispatch_method = function.__get__(engine, self.Endpoint)
+        else:
+            dispatch_method = self.get_dispatch_method(engine=engine)
 
-        # Call into the endpoint
-        method_response = dispatch_method()
+        return response, engine, dispatch_method
 
-        # Override default response
-        if method_response:
-            response = method_response
+    def _serialize(self, engine, response, cache_key=None):
+        serializer = self.get_serializer()
+        if engine.stream_response:
+            return serializer.serialize_response_stream(response)
+        body = serializer.serialize_response(response)
+        if (self._hash_etag and response.status_code == 200 and
+                engine.request.method == 'GET' and 'ETag' not in response.headers):
+            token = hashlib.blake2b(body.encode('utf-8'), digest_size=16).hexdigest()
+            if self._not_modified(engine.request, response, token):
+                return ''
+        if cache_key is not None and response.status_code == 200:
+            engine.response_cache.set(
+                cache_key,
+                (response.status_code, dict(response.headers), body),
+                engine.cache_ttl,
+            )
+        return body
 
-        engine.post_request()
+    def _cache_key(self, engine, scope):
+        """
+        Returns the response cache key of a request, or None to skip the
+        cache when the endpoint has no scope for the current user.
+        """
+        if scope is None:
+            return None
+        request = engine.request
+        params = request.params
+        if params is None:
+            params_key = ()
+        else:
+            # resource based parameters hold the standard query parameters
+            # as attributes rather than fields
+            params_key = (
+                tuple(sorted(params.items(), key=lambda item: item[0])),
+                tuple(getattr(params, name, None)
+                      for name in sorted(VALID_QUERY_PARAMETERS)),
+            )
+        identifiers = tuple(sorted((request.identifiers or {}).items()))
+        key = repr((self.request_type, identifiers, params_key, scope))
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+        return engine.response_cache.key(engine.get_cache_namespace(), digest)
 
-        serializer = self.get_serializer()
-        serialized_body = serializer.serialize_response(response)
+    def _get_cached(self, engine, response, cache_key):
+        """
+        Returns the response and body cached under a key, or None. A cached
+        response with an ETag matching the request is answered 304.
+        """
+        if cache_key is None:
+            return None
+        cached = engine.response_cache.get(cache_key)
+        if cached is None:
+            return None
+        response.status_code, headers, body = cached
+        response.headers.update(headers)
+        etag = headers.get('ETag')
+        if etag is not None and engine.request.etag_matches(etag):
+            response.status_code = 304
+            body = ''
+        return response, body
 
-        return response, serialized_body
+    @staticmethod
+    def _not_modified(request, response, token):
+        """
+        Sets the ETag of the response from a version token and returns
+        whether the request already holds it, the response is then a 304.
+        """
+        if token is None:
+            return False
+        etag = response.set_etag(token)
+        if request.etag_matches(etag):
+            response.status_code = 304
+            return True
+        return False
 
     def get_dispatch_method(self, engine):
         """ find the method in the engine that matches the request """
@@ -74,7 +289,7 @@ class DispatcherBase(object):
                                                 self.request_type))
 
     def get_serializer(self):
-        return JsonSerializer()
+        return self.serializer
 
 
 class CollectionDispatcher(DispatcherBase):
@@ -85,7 +300,7 @@ class CollectionDispatcher(DispatcherBase):
     request_type = 'collection'
 
     def pre_request(self, engine):
-        engine.pre_request_collection()
+        return engine.pre_request_collection()
 
     def build_response_obj(self, request):
         method = request.method.lower()
@@ -93,6 +308,9 @@ class CollectionDispatcher(DispatcherBase):
             response = DetailResponse(request)
         else:
             response = CollectionResponse(request=request)
+            response.cursor_pagination = getattr(
+                self.Endpoint, 'cursor_pagination', False)
+            response.cursor_key = getattr(self.Endpoint, 'cursor_key', 'id')
         return response
 
 
@@ -104,7 +322,8 @@ class DetailDispatcher(DispatcherBase):
     request_type = 'detail'
 
     def pre_request(self, engine):
-        engine.pre_request_detail()
+        return engine.pre_request_detail()
 
     def build_response_obj(self, request):
         return DetailResponse(request)
+
@@ -1,3 +1,5 @@
+import inspect
+
 from . import errors
 
 
@@ -14,6 +16,44 @@ class Endpoint(object):
     _authenticator_classes = None
     Resource = None
 
+    # When True the response body is returned as an iterator of byte chunks,
+    # collections are then serialized one resource at a time as they are sent
+    stream_response = False
+
+    # When True collections are paginated by an opaque ``cursor`` encoding the
+    # sort values of the last resource sent, rather than by ``offset``
+    cursor_pagination = False
+
+    # The unique field added last to the sort of cursor paginated collections,
+    # so resources with equal sort values are never split by a cursor.
+    # Endpoints sorting in their datastore must order by it as well
+    cursor_key = 'id'
+
+    # When True json request bodies are decoded straight into validated
+    # Resource's, request.resource and request.resources then hold resources
+    # rather than dictionaries and unknown keys are rejected
+    decode_resources = False
+
+    # A JsonBackend used to encode responses and decode_resources request
+    # bodies, such as serializer.OrjsonBackend() which is faster but doesn't
+    # produce or accept the same json, None for the standard library
+    json_backend = None
+
+    # When True GET responses get an ETag hashed from the serialized body and
+    # requests with a matching If-None-Match header are answered 304 without
+    # a body. Streamed responses are not hashed, see also etag_detail
+    etag_response = False
+
+    # A ResponseCache to serve GET responses from, keyed on the request type,
+    # identifiers, query parameters and cache_scope(), which must be
+    # overridden for the cache to be used. Write methods call
+    # invalidate_cache() to discard the cached responses of the namespace,
+    # which defaults to the qualified class name of the Resource, so a write
+    # through any endpoint of a resource invalidates all of them
+    response_cache = None
+    cache_ttl = 60
+    cache_namespace = None
+
     def __init__(self, request, response):
         self.request = request
         self.response = response
@@ -26,6 +66,32 @@ class Endpoint(object):
             for auth in self._authenticators:
                 auth.check_auth(method)
 
+    @classmethod
+    def get_cache_namespace(cls):
+        if cls.cache_namespace:
+            return cls.cache_namespace
+        owner = cls.Resource if cls.Resource is not None else cls
+        return '{0}.{1}'.format(owner.__module__, owner.__qualname__)
+
+    def cache_scope(self):
+        """
+        Returns a key for what the current user is allowed to see, such as an
+        account id, so cached responses are only served within a scope, or
+        None to skip the cache, which is the default.
+
+        It is called after authentication but before the pre_request hooks,
+        which are not run for a cached response. Any authorization or
+        existence checks made in them must be part of the scope, or the
+        scope must be None when they would fail. Endpoints whose responses
+        are the same for every user return ``''``.
+        """
+        return None
+
+    def invalidate_cache(self):
+        """ Discards the responses cached for the namespace of the endpoint. """
+        if self.response_cache is not None:
+            self.response_cache.invalidate(self.get_cache_namespace())
+
     def pre_request(self):
         pass
 
@@ -38,6 +104,20 @@ class Endpoint(object):
     def post_request(self):
         pass
 
+    def etag_detail(self):
+        """
+        Override to return a version token of the requested resource, such
+        as a revision number, which is sent as the ETag of GET responses.
+        It is called before :meth:`get_detail`, so a request with a matching
+        If-None-Match header is answered 304 without loading the resource.
+        Returning None skips the check.
+        """
+        return None
+
+    def etag_collection(self):
+        """ The :meth:`etag_detail` equivalent for collections. """
+        return None
+
     def get_detail(self):
         raise errors.MethodNotImplementedError()
 
@@ -72,3 +152,36 @@ class Endpoint(object):
         raise errors.MethodNotImplementedError()
 
 
+class AsyncEndpoint(Endpoint):
+    """
+    An :class:`Endpoint` whose methods and hooks may be coroutines, for
+    example ``async def get_collection(self)``. They are awaited by
+    :meth:`.DispatcherBase.dispatch_async`, which lets an asynchronous server
+    such as :class:`.ThoriumASGI` handle other requests while the endpoint
+    waits on its datastore. Authenticators may be either
+    :class:`.Authenticator`'s or :class:`.AsyncAuthenticator`'s.
+    """
+
+    async def authenticate(self, method):
+        if self._authenticators:
+            for auth in self._authenticators:
+                await maybe_await(auth.check_auth(method))
+
+    async def pre_request(self):
+        pass
+
+    async def pre_request_detail(self):
+        pass
+
+    async def pre_request_collection(self):
+        pass
+
+    async def post_request(self):
+        pass
+
+
+async def maybe_await(result):
+    """ Awaits the result of a call if it is awaitable, otherwise returns it. """
+    if inspect.isawaitable(result):
+        return await result
+    return result
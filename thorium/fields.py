@@ -2,7 +2,8 @@
 
 import re
 
-from . import errors, validators, NotSet
+from . import errors, validators
+from .datastructures import NotSet
 
 
 class ResourceField(object):
@@ -46,6 +47,16 @@ class ResourceField(object):
         cast = self.flags['cast'] if self.flags['cast'] is not None else cast
         return self._validator.validate(value, cast)
 
+    def compile_validator(self, cast=False):
+        """
+        Returns a single argument function equivalent to
+        ``validate(value, cast)`` with the field flags resolved once.
+        """
+        if type(self).validate is not ResourceField.validate:
+            return lambda value: self.validate(value, cast)
+        cast = self.flags['cast'] if self.flags['cast'] is not None else cast
+        return self._validator.compile(cast)
+
     @property
     def is_readonly(self):
         return self.flags['readonly']
@@ -135,7 +146,7 @@ class ListField(ResourceField):
 
     def set_unique_attributes(self, item_type=NotSet):
         if item_type:
-            if item_type == NotSet or not isinstance(item_type, ResourceField):
+            if item_type is NotSet or not isinstance(item_type, ResourceField):
                 raise errors.ValidationError('ListField must have an item_type set to a valid ResourceField')
             self.flags['item_type'] = item_type
         else:
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+    thorium.native
+    ~~~~~~~~~~~~~~
+
+    Request handling shared by the server adapters which serve Thorium
+    routes without Flask, see :class:`.ThoriumWSGI` and :class:`.ThoriumASGI`.
+
+"""
+
+import json
+from http import HTTPStatus
+from urllib.parse import parse_qsl
+
+from . import errors
+from .request import Request
+from .resources import VALID_METHODS, VALID_QUERY_PARAMETERS
+from .parameters import ParametersMetaClass
+
+
+# headers matching those added by the crossdomain decorator in ThoriumFlask
+CORS_HEADERS = [
+    ('Access-Control-Max-Age', '21600'),
+    ('Access-Control-Allow-Headers',
+     'accept, origin, content-type, X-EM-Token, authorization'),
+    ('Access-Control-Expose-Headers', 'Location, X-EM-Token'),
+    ('Access-Control-Allow-Credentials', 'true'),
+]
+
+OPTIONS_ALLOW = ', '.join(sorted({m.upper() for m in VALID_METHODS} | {'HEAD'}))
+
+
+class NativeEndpoint(object):
+    """
+    Builds :class:`.Request`'s and response headers for one route from the
+    raw request data handed over by a server adapter.
+
+    :param dispatcher: The :class:`.DispatcherBase` of the route
+    :param exception_handler: The :class:`.ExceptionHandler` of the app
+    """
+
+    def __init__(self, dispatcher, exception_handler):
+        self.dispatcher = dispatcher
+        self.exception_handler = exception_handler
+
+    def build_request(self, method, url, headers, query_string, body, view_args):
+        """
+        HEAD requests are dispatched as GET, their body is dropped by
+        :func:`prepare_body`.
+
+        :param method: The upper case http method
+        :param url: The full url of the request
+        :param headers: A dictionary of request headers with lower case names
+        :param query_string: The raw url query string as bytes
+        :param body: The request body as bytes
+        :param view_args: The url variables matched by the route
+        """
+        try:
+            resource = None
+            resources = []
+            mimetype = headers.get('content-type', '').split(';')[0].strip()
+            if method in {'POST', 'PATCH', 'PUT'}:
+                decoder = getattr(self.dispatcher, 'decoder', None)
+                if mimetype == 'application/json' and decoder is not None:
+                    resource, resources = decoder.decode(
+                        body, method == 'PATCH', view_args)
+                elif mimetype == 'application/json':
+                    try:
+                        json_data = json.loads(body.decode('utf-8')) if body else {}
+                    except ValueError:
+                        raise errors.BadRequestError(
+                            'Failed to decode JSON object')
+                    json_data = json_data or {}
+                    partial = method == 'PATCH'
+
+                    # hack for single or list resources
+                    if isinstance(json_data, list):
+                        for i in json_data:
+                            resources.append(self._create_resource(i, partial, view_args))
+                    else:
+                        resource = self._create_resource(json_data, partial, view_args)
+
+                else:
+                    raise errors.BadRequestError(
+                        'Currently only json is supported, use application/'
+                        'json mimetype')
+
+            return Request(
+                dispatcher=self.dispatcher,
+                method='GET' if method == 'HEAD' else method,
+                identifiers=view_args,
+                query_params=self._build_parameters(query_string, view_args),
+                mimetype=mimetype,
+                resource=resource,
+                resources=resources,
+                url=url,
+                headers=headers,
+            )
+        except errors.ValidationError as e:
+            raise errors.BadRequestError(message=e.args[0] if e.args else None)
+
+    def handle_http_exception(self, e, request):
+        """ Returns the status, headers and body of an error response. """
+        body = self.exception_handler.handle_http_exception(
+            http_error=e,
+            request=request,
+        )
+        return e.status_code, e.headers, body
+
+    def handle_general_exception(self, e, request, url, method):
+        """ Logs the exception and returns an internal server error response. """
+        body = self.exception_handler.handle_general_exception(
+            url=url,
+            method=method,
+            e=e,
+            request=request,
+        )
+        return 500, {}, body
+
+    def _create_resource(self, data, partial, view_args):
+        # override body data with url identifiers
+        data.update(view_args)
+        return data
+
+    def _build_parameters(self, query_string, view_args):
+        if not self.dispatcher.Parameters:
+            return None
+
+        if isinstance(self.dispatcher.Parameters, ParametersMetaClass):
+            return self.dispatcher.Parameters.validate_query_string(query_string)
+        else:
+            query_params = parse_query_string(query_string)
+            self._validate_no_extra_query_params(query_params)
+            query_params.update(view_args)
+            params = self.dispatcher.Parameters.init_from_dict(
+                data=query_params,
+                partial=True,
+                cast=True,
+            )
+            params.sort = query_params.get('sort')
+            if not hasattr(params, 'offset'):
+                params.offset = query_params.get('offset')
+            if not hasattr(params, 'limit'):
+                params.limit = query_params.get('limit')
+            if not hasattr(params, 'cursor'):
+                params.cursor = query_params.get('cursor')
+            if not hasattr(params, 'fields'):
+                params.fields = query_params.get('fields')
+            return params
+
+    def _validate_no_extra_query_params(self, query_params):
+        param_fields = dict(self.dispatcher.Parameters.all_fields())
+        for name, param in query_params.items():
+            if name not in param_fields and name not in VALID_QUERY_PARAMETERS:
+                raise errors.ValidationError(
+                    '{0} is not a supported query parameter.'.format(name)
+                )
+
+
+def parse_query_string(query_string):
+    """ Returns the first value of each parameter in a raw query string. """
+    query_params = {}
+    query_string = query_string.decode('utf-8', 'replace')
+    for name, value in parse_qsl(query_string, keep_blank_values=True):
+        query_params.setdefault(name, value)
+    return query_params
+
+
+def response_headers(headers, request_headers):
+    """
+    Returns the headers of a response as a list of name and value tuples,
+    adding the json content type and the cross domain headers.
+
+    :param headers: The headers set on the response or http error
+    :param request_headers: A dictionary of request headers with lower case
+        names
+    """
+    header_list = [('Content-Type', 'application/json')]
+    header_list.extend((name, str(value)) for name, value in headers.items())
+    header_list.append(('Access-Control-Allow-Origin',
+                        request_headers.get('origin', '*')))
+    header_list.extend(CORS_HEADERS)
+    header_list.append(('Access-Control-Allow-Methods', OPTIONS_ALLOW))
+    return header_list
+
+
+def decode_headers(headers):
+    """
+    Returns a dictionary of request headers with lower case names.
+
+    :param headers: An iterable of header name and value strings
+    """
+    return {name.lower(): value for name, value in headers}
+
+
+def status_line(status):
+    return '{0} {1}'.format(status, HTTPStatus(status).phrase)
+
+
+def prepare_body(method, status, headers, body):
+    """
+    Returns a serialized response body as bytes, appending its
+    Content-Length to ``headers``, or as the iterator of byte chunks of a
+    streamed response. The response to a HEAD request keeps the headers of
+    the GET response but has an empty body, as under Flask.
+
+    :param method: The upper case http method of the request
+    :param status: The status code of the response
+    :param headers: The list of response headers from :func:`response_headers`
+    :param body: A string, bytes or an iterator of byte chunks
+    """
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    if isinstance(body, bytes):
+        # a 304 has no body but no Content-Length of its own either
+        if status != 304:
+            headers.append(('Content-Length', str(len(body))))
+        return b'' if method == 'HEAD' else body
+    if method == 'HEAD':
+        close = getattr(body, 'close', None)
+        if close is not None:
+            close()
+        return b''
+    return body
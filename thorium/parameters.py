@@ -1,5 +1,13 @@
+import copy
+
+from functools import lru_cache
+from urllib.parse import parse_qsl
+
 from . import errors, NotSet, fields, params
 
+# validated values copied for each caller of validate_query_string
+MUTABLE_TYPES = (list, set, dict)
+
 
 class ParametersMetaClass(type):
 
@@ -12,10 +20,23 @@ class ParametersMetaClass(type):
             elif isinstance(param, fields.ResourceField):
                 raise Exception('Expected subclass of ResourceParam, got {0}'.format(param))
         attrs['_params'] = params_dict
-        return super().__new__(mcs, parameters_name, bases, attrs)
+
+        # validate functions and defaults resolved once per class
+        attrs['_compiled'] = {
+            name: (param.compile_validator(), param.default)
+            for name, param in params_dict.items()
+        }
+        cls = super().__new__(mcs, parameters_name, bases, attrs)
+        cls._query_cache = staticmethod(
+            lru_cache(maxsize=cls.query_cache_size)(cls._validate_query_string)
+        )
+        return cls
 
 
 class Parameters(object, metaclass=ParametersMetaClass):
+    # Number of distinct query strings whose validated parameters are kept
+    # by validate_query_string(), None for an unbounded cache
+    query_cache_size = 256
 
     def __new__(cls, *args, **kwargs):
         return super().__new__(cls)
@@ -23,16 +44,39 @@ class Parameters(object, metaclass=ParametersMetaClass):
     @classmethod
     def validate(cls, input_params):
         params_dict = {}
+        compiled = cls._compiled
 
-        for name, param in input_params.items():
-            if name not in cls._params:
+        for name in input_params:
+            if name not in compiled:
                 raise errors.ValidationError(name + ' is not a supported query parameter.')
 
-        for name, param in cls._params.items():
+        for name, (validate, default) in compiled.items():
             if name in input_params:
-                params_dict[name] = param.validate(input_params[name])
+                params_dict[name] = validate(input_params[name])
             else:
-                default = param.default()
+                default = default()
                 if default is not NotSet:
                     params_dict[name] = default
         return params_dict
+
+    @classmethod
+    def validate_query_string(cls, query_string):
+        """
+        Validates the parameters of a raw url query string. Results are kept
+        in a per class LRU cache keyed on the query string, each call returns
+        a new dictionary with copies of any list, set or dict values so it
+        may be modified freely. Invalid query strings are not cached.
+        """
+        return {
+            name: copy.deepcopy(value) if isinstance(value, MUTABLE_TYPES) else value
+            for name, value in cls._query_cache(query_string)
+        }
+
+    @classmethod
+    def _validate_query_string(cls, query_string):
+        if isinstance(query_string, bytes):
+            query_string = query_string.decode('utf-8', 'replace')
+        input_params = {}
+        for name, value in parse_qsl(query_string, keep_blank_values=True):
+            input_params.setdefault(name, value)
+        return tuple(cls.validate(input_params).items())
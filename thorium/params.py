@@ -25,6 +25,15 @@ class ResourceParam(object):
     def validate(self, value, cast=True):
         return self._validator.validate(value, cast=cast)
 
+    def compile_validator(self):
+        """
+        Returns a single argument function equivalent to ``validate(value)``
+        with the validation steps resolved once.
+        """
+        if type(self).validate is not ResourceParam.validate:
+            return self.validate
+        return self._validator.compile(cast=True)
+
     def default(self):
         return self.flags['default']
 
@@ -51,6 +60,9 @@ class CharParam(ResourceParam):
         """
         return super().validate(value, cast)
 
+    def compile_validator(self):
+        return self._validator.compile(cast=False)
+
 
 class IntParam(ResourceParam):
     validator_type = validators.IntValidator
@@ -77,7 +89,7 @@ class ListParam(ResourceParam):
 
     def set_unique_attributes(self, item_type=None):
         if item_type:
-            if item_type == validators.NotSet or not isinstance(item_type, ResourceParam):
+            if item_type is validators.NotSet or not isinstance(item_type, ResourceParam):
                 raise errors.ValidationError('ListParam must have an item_type set to a valid ResourceParam')
             self.flags['item_type'] = item_type
         else:
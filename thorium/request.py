@@ -1,6 +1,10 @@
+from . import errors
+
+
 class Request(object):
 
-    def __init__(self, dispatcher, method, identifiers, query_params, mimetype, resource, resources, url):
+    def __init__(self, dispatcher, method, identifiers, query_params, mimetype, resource, resources, url,
+                 headers=None):
         self.method = method
         self.identifiers = identifiers
         self.params = query_params
@@ -8,4 +12,55 @@ class Request(object):
         self.resource = resource
         self.resources = resources
         self.request_type = dispatcher.request_type
+        self.resource_cls = getattr(dispatcher, 'Resource', None)
         self.url = url
+        # looked up by lower case name
+        self.headers = headers if headers is not None else {}
+        self.fields = self._get_fields()
+
+    def etag_matches(self, etag):
+        """
+        Whether the If-None-Match header of the request matches an ETag,
+        using the weak comparison of RFC 7232 as for a GET.
+        """
+        header = self.headers.get('if-none-match')
+        if not header:
+            return False
+        if header.strip() == '*':
+            return True
+        etag = etag[2:] if etag.startswith('W/') else etag
+        for candidate in header.split(','):
+            candidate = candidate.strip()
+            if candidate.startswith('W/'):
+                candidate = candidate[2:]
+            if candidate == etag:
+                return True
+        return False
+
+    def _get_fields(self):
+        """
+        Returns the names of the fields selected by the ``fields`` query
+        parameter in declaration order, which endpoints may use to narrow
+        what they load, or None when all fields are requested.
+        """
+        params = self.params
+        if params is None or self.resource_cls is None:
+            return None
+        if hasattr(params, 'get'):
+            value = params.get('fields')
+        else:
+            value = getattr(params, 'fields', None)
+        if not value:
+            return None
+        if isinstance(value, str):
+            value = value.split(',')
+
+        names = {name.strip() for name in value if name.strip()}
+        if not names:
+            return None
+        unknown = names.difference(self.resource_cls._fields)
+        if unknown:
+            raise errors.ValidationError('{0} is not a field of {1}.'.format(
+                ', '.join(sorted(unknown)), self.resource_cls.__name__))
+        return tuple(name for name, _ in self.resource_cls._sorted_fields
+                     if name in names)
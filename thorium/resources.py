@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
 
+from collections import OrderedDict
+
 from . import errors, fields, NotSet
 
 
 VALID_METHODS = {'get', 'post', 'put', 'patch', 'delete', 'options'}
-VALID_QUERY_PARAMETERS = {'sort', 'offset', 'limit'}
+VALID_QUERY_PARAMETERS = {'sort', 'offset', 'limit', 'cursor', 'fields'}
 
 
 class ResourceMetaClass(type):
@@ -18,9 +20,83 @@ class ResourceMetaClass(type):
             if hasattr(base, '_fields'):
                 attrs['_fields'].update(base._fields)
         # update fields based on current class attributes
-        attrs['_fields'].update(mcs._get_fields(bases, attrs))
+        own_fields = mcs._get_fields(bases, attrs)
+        attrs['_fields'].update(own_fields)
+
+        # compact mode is opt-in and inherited by subclasses
+        compact = bool(attrs.get('_compact') or
+                       any(getattr(base, '_compact', False) for base in bases))
+        attrs['_compact'] = compact
+        if compact:
+            mcs._compact_storage(attrs, own_fields)
+        else:
+            attrs['_keys'] = {name: name for name in attrs['_fields']}
+
+        mcs._compile_plan(attrs)
+        mcs._compile_field_order(attrs)
         return super().__new__(mcs, resource_name, bases, attrs)
 
+    @staticmethod
+    def _compact_storage(attrs, own_fields):
+        """
+        Assigns each field a fixed index into the ``_values`` list and
+        replaces the field properties with :class:`CompactFieldDescriptor`'s
+        reading directly from that index. No ``__dict__`` is created for
+        instances unless a parent class already has one.
+        """
+        attrs.setdefault('__slots__', ())
+        attrs['_keys'] = {}
+        for index, name in enumerate(attrs['_fields']):
+            attrs['_keys'][name] = index
+            # inherited fields are redefined since their index may differ
+            if name in own_fields or name not in attrs:
+                attrs[name] = CompactFieldDescriptor(name, index)
+
+    @staticmethod
+    def _compile_plan(attrs):
+        """
+        Builds the validation plan used by :meth:`Resource._set` and the
+        ``from_*`` methods. For both cast modes, each field name maps to its
+        key in ``_values``, a compiled validate function and whether the
+        field accepts NotSet on a non-partial resource, so the per value work
+        is a flat loop with the field flags already resolved.
+        """
+        keys = attrs['_keys']
+        plan = {False: {}, True: {}}
+        for name, field in attrs['_fields'].items():
+            notset_allowed = bool(field.is_readonly or field.is_immutable)
+            for cast in (False, True):
+                plan[cast][name] = (keys[name],
+                                    field.compile_validator(cast),
+                                    notset_allowed)
+        attrs['_plan'] = plan
+
+        # keys and fields which must be set for validate() to pass
+        attrs['_full_required'] = tuple(
+            (keys[name], field) for name, field in attrs['_fields'].items()
+            if not (field.is_readonly or field.is_immutable)
+        )
+        attrs['_partial_required'] = tuple(
+            (keys[name], field) for name, field in attrs['_fields'].items()
+            if field.is_required
+        )
+
+    @staticmethod
+    def _compile_field_order(attrs):
+        """
+        Sorts the fields by declaration order once per class. Both tuples
+        hold ``(name, key)`` pairs, ``_sorted_fields`` for every field and
+        ``_collection_fields`` for the fields included in collection
+        responses, which exclude ``detail`` fields.
+        """
+        keys = attrs['_keys']
+        ordered = sorted(attrs['_fields'].items(),
+                         key=lambda item: item[1].order_value)
+        attrs['_sorted_fields'] = tuple(
+            (name, keys[name]) for name, field in ordered)
+        attrs['_collection_fields'] = tuple(
+            (name, keys[name]) for name, field in ordered if not field.detail)
+
     # Note: will likely need some sort of sorted dictionary to maintain
     # field order
     @staticmethod
@@ -53,11 +129,53 @@ class ResourceMetaClass(type):
         return set_field_property
 
 
+class CompactFieldDescriptor(object):
+    """
+    Field accessor used by compact resources, reads the value straight out of
+    the ``_values`` list at the index assigned by :class:`ResourceMetaClass`.
+    """
+    __slots__ = ('name', 'index')
+
+    def __init__(self, name, index):
+        self.name = name
+        self.index = index
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+        return obj._values[self.index]
+
+    def __set__(self, obj, value):
+        obj._set(self.name, value)
+
+
 class Resource(object, metaclass=ResourceMetaClass):
+    # Set _compact = True on a subclass to store values in a fixed size list
+    # on a __slots__ instance rather than in dictionaries. Compact resources
+    # do not accept attributes other than their fields.
+    # Set _frozen = True on a subclass whose resources rarely change to have
+    # the JsonSerializer cache each resource's serialized json. Setting a
+    # field discards the cache, values changed in place such as appending to
+    # a list field are not detected.
+    __slots__ = ('_values', '_partial', '_serialized')
+    _compact = False
+    _frozen = False
     _fields = {}
+    _keys = {}
+    _plan = {False: {}, True: {}}
+    _full_required = ()
+    _partial_required = ()
+    _sorted_fields = ()
+    _collection_fields = ()
 
     def __new__(cls, *args, **kwargs):
         obj = super().__new__(cls)
+        if cls._compact:
+            obj._values = [
+                field.default() if callable(field.default) else field.default
+                for field in cls._fields.values()
+            ]
+            return obj
         obj._values = {}
         for name, field in obj.all_fields():
             if callable(field.default):
@@ -101,6 +219,91 @@ class Resource(object, metaclass=ResourceMetaClass):
         resource.validate()
         return resource
 
+    @classmethod
+    def init_many_from_dicts(cls, data, partial=False, cast=False, lazy=False):
+        """
+        Builds a resource from each dictionary in ``data``, the same as
+        calling :meth:`init_from_dict` on each but with the per class work
+        done once for the batch. Returns a list, or a generator if ``lazy``.
+        """
+        plan = tuple(cls._plan[bool(cast)].items())
+
+        def fill(resource, values, item):
+            for name, (key, validate, notset_allowed) in plan:
+                if name in item:
+                    value = item[name]
+                    if value is NotSet and not (partial or notset_allowed):
+                        resource._raise_set_notset(name)
+                    values[key] = validate(value)
+
+        resources = cls._iter_many(data, partial, fill)
+        return resources if lazy else list(resources)
+
+    @classmethod
+    def init_many_from_objs(cls, objs, partial=False, mapping=None,
+                            override=None, cast=False, lazy=False):
+        """
+        Builds a resource from each object in ``objs``, the same as calling
+        :meth:`init_from_obj` on each but with the mapping and override
+        resolved once for the batch. Returns a list, or a generator if
+        ``lazy``.
+        """
+        mapping = mapping if mapping else {}
+        override = override if override else {}
+
+        # (key, validate, attribute name or None if overridden, override value)
+        steps = []
+        for name, (key, validate, _) in cls._plan[bool(cast)].items():
+            value = override.get(name, NotSet)
+            if value is not NotSet:
+                steps.append((key, validate, None, value))
+            elif name not in mapping:
+                steps.append((key, validate, name, NotSet))
+            elif mapping[name]:
+                steps.append((key, validate, mapping[name], NotSet))
+        steps = tuple(steps)
+
+        def fill(resource, values, obj):
+            for key, validate, attr, value in steps:
+                if attr is not None:
+                    value = getattr(obj, attr, NotSet)
+                    if value is NotSet:
+                        continue
+                values[key] = validate(value)
+
+        resources = cls._iter_many(objs, partial, fill)
+        return resources if lazy else list(resources)
+
+    @classmethod
+    def _iter_many(cls, items, partial, fill):
+        # default values as __new__ and clear() would leave them
+        template = [] if cls._compact else {}
+        factories = []
+        for name, field in cls._fields.items():
+            key = cls._keys[name]
+            value = field.default
+            if partial and not field.is_required:
+                value = NotSet
+            elif callable(value):
+                factories.append((key, value))
+            if cls._compact:
+                template.append(value)
+            else:
+                template[key] = value
+        required = cls._partial_required if partial else cls._full_required
+
+        for item in items:
+            resource = object.__new__(cls)
+            resource._partial = partial
+            values = resource._values = template.copy()
+            for key, factory in factories:
+                values[key] = factory()
+            fill(resource, values, item)
+            for key, field in required:
+                if values[key] is NotSet:
+                    resource.validate()
+            yield resource
+
     @classmethod
     def empty(cls):
         resource = cls.__new__(cls)
@@ -130,15 +333,22 @@ class Resource(object, metaclass=ResourceMetaClass):
             if self._partial:
                 self._set(name, NotSet)
             else:
-                if field.flags['default'] == NotSet:
+                if field.flags['default'] is NotSet:
                     self._set(name, None)
                 else:
                     self.to_default(name)
 
     def from_dict(self, data, cast=False):
-        for name, field in self.all_fields():
+        if self._frozen:
+            self._serialized = None
+        values = self._values
+        partial = self._partial
+        for name, (key, validate, notset_allowed) in self._plan[bool(cast)].items():
             if name in data:
-                self._set(name, data[name], cast)
+                value = data[name]
+                if value is NotSet and not (partial or notset_allowed):
+                    self._raise_set_notset(name)
+                values[key] = validate(value)
         return self
 
     def to_dict(self):
@@ -155,15 +365,19 @@ class Resource(object, metaclass=ResourceMetaClass):
         """
         if not override:
             override = {}
+        if self._frozen:
+            self._serialized = None
 
-        for field_name, _ in self.all_fields():
+        values = self._values
+        partial = self._partial
+        for field_name, (key, validate, notset_allowed) in self._plan[bool(cast)].items():
             mapped_name = field_name
 
             # first attempt to find value in override
             value = override.get(field_name, NotSet)
 
             # if value isn't overridden, get it from the obj
-            if value == NotSet:
+            if value is NotSet:
 
                 # Convert name to mapped name if available,
                 # else use Resource's existing name
@@ -180,7 +394,9 @@ class Resource(object, metaclass=ResourceMetaClass):
                 if value is NotSet:
                     continue
 
-            self._set(field_name, value, cast)
+            if value is NotSet and not (partial or notset_allowed):
+                self._raise_set_notset(field_name)
+            values[key] = validate(value)
 
         return self
 
@@ -206,7 +422,7 @@ class Resource(object, metaclass=ResourceMetaClass):
             value = override.get(field_name, NotSet)
 
             # if value isn't overridden, get it from the field
-            if value == NotSet:
+            if value is NotSet:
 
                 # Convert name to mapped name if available,
                 # else use Resource's existing name
@@ -225,7 +441,7 @@ class Resource(object, metaclass=ResourceMetaClass):
                 value = self._get(field_name)
 
                 # if we still don't have a value, skip this field
-                if value == NotSet:
+                if value is NotSet:
                     continue
 
             # Set target obj value from Resource value
@@ -241,9 +457,12 @@ class Resource(object, metaclass=ResourceMetaClass):
         return ((name, field) for name, field in self.all_fields() if self.is_set(name))
 
     def sorted_items(self):
-        return ((n, self._get(n)) for n, v in sorted(self.all_fields(), key=lambda x: x[1].order_value))
+        values = self._values
+        return ((name, values[key]) for name, key in self._sorted_fields)
 
     def items(self):
+        if self._compact:
+            return zip(self._fields, self._values)
         return self._values.items()
 
     def valid_items(self):
@@ -256,20 +475,18 @@ class Resource(object, metaclass=ResourceMetaClass):
             self._validate_full()
 
     def _validate_full(self):
-        for name, field in self._fields.items():
-            if not (
-                self.is_set(name)
-                or field.is_readonly
-                or field.is_immutable
-            ):
+        values = self._values
+        for key, field in self._full_required:
+            if values[key] is NotSet:
                 raise errors.ValidationError(
                     'Field {0} is NotSet, expected full resource.'
                     .format(field)
                 )
 
     def _validate_partial(self):
-        for name, field in self._fields.items():
-            if not self.is_set(name) and field.is_required:
+        values = self._values
+        for key, field in self._partial_required:
+            if values[key] is NotSet:
                 raise errors.ValidationError(
                     'Field {0} is required, cannot be NotSet even on a '
                     'partial resource.'.format(field)
@@ -283,21 +500,162 @@ class Resource(object, metaclass=ResourceMetaClass):
         return self._partial
 
     def is_set(self, field_name):
-        return self._get(field_name) != NotSet
+        return self._get(field_name) is not NotSet
 
     def _set(self, field_name, value, cast=False):
-        field = self._fields[field_name]
-        if value == NotSet and not (
-            self._partial
-            or field.is_readonly
-            or field.is_immutable
-        ):
-            raise errors.ValidationError(
-                'Attempted to set field {0} of a non-partial resource to '
-                'NotSet'.format(field)
-            )
-        self._values[field_name] = field.validate(value, cast=cast)
-        return self._values[field_name]
+        key, validate, notset_allowed = self._plan[bool(cast)][field_name]
+        if value is NotSet and not (self._partial or notset_allowed):
+            self._raise_set_notset(field_name)
+        if self._frozen:
+            self._serialized = None
+        value = self._values[key] = validate(value)
+        return value
+
+    def _raise_set_notset(self, field_name):
+        raise errors.ValidationError(
+            'Attempted to set field {0} of a non-partial resource to '
+            'NotSet'.format(self._fields[field_name])
+        )
 
     def _get(self, field_name):
-        return self._values[field_name]
+        return self._values[self._keys[field_name]]
+
+
+class ResourceCollection(object):
+    """
+    An ordered collection of resources of one :class:`Resource` class stored
+    as a list of values per field, rather than as individual resources. A
+    :class:`Resource` is only built when an item is accessed, and
+    :class:`.CollectionResponse` sorts, paginates and serializes the columns
+    directly, so large responses never hold an object per row.
+
+    :param resource_cls: The :class:`Resource` class of the items
+    :param columns: Optional dictionary of every field name to a list of
+        already validated values, all of the same length
+    """
+
+    def __init__(self, resource_cls, columns=None):
+        self.resource_cls = resource_cls
+        self._names = tuple(resource_cls._fields)
+        if columns is None:
+            columns = {name: [] for name in self._names}
+        elif set(columns) != set(self._names):
+            raise ValueError('Columns of a {0} collection must match its fields.'
+                             .format(resource_cls.__name__))
+        self._columns = columns
+        self._length = len(columns[self._names[0]]) if self._names else 0
+
+    @classmethod
+    def from_dicts(cls, resource_cls, data, cast=False):
+        """ Validates each dictionary in ``data`` as a full resource. """
+        collection = cls(resource_cls)
+        collection.extend(resource_cls.init_many_from_dicts(data, cast=cast, lazy=True))
+        return collection
+
+    @classmethod
+    def from_objs(cls, resource_cls, objs, mapping=None, override=None,
+                  cast=False):
+        """ Validates each object in ``objs`` as a full resource. """
+        collection = cls(resource_cls)
+        collection.extend(resource_cls.init_many_from_objs(
+            objs, mapping=mapping, override=override, cast=cast, lazy=True))
+        return collection
+
+    @classmethod
+    def from_columns(cls, resource_cls, columns, cast=False):
+        """
+        Validates a dictionary of field name to list of values. Missing
+        fields take their default value, which must be valid for a full
+        resource.
+        """
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise errors.ValidationError('Columns must all have the same length.')
+        length = lengths.pop() if lengths else 0
+        validated = {}
+        for name, (key, validate, notset_allowed) in resource_cls._plan[bool(cast)].items():
+            field = resource_cls._fields[name]
+            if name in columns:
+                values = [validate(value) for value in columns[name]]
+            elif callable(field.default):
+                values = [field.default() for _ in range(length)]
+            else:
+                values = [field.default] * length
+            if not notset_allowed and any(value is NotSet for value in values):
+                raise errors.ValidationError(
+                    'Field {0} is NotSet, expected full resource.'.format(field)
+                )
+            validated[name] = values
+        unknown = set(columns) - set(validated)
+        if unknown:
+            raise errors.ValidationError('Unknown fields {0}.'.format(
+                ', '.join(sorted(unknown))))
+        return cls(resource_cls, validated)
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield self._resource(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return type(self)(self.resource_cls, {
+                name: values[index] for name, values in self._columns.items()
+            })
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('ResourceCollection index out of range')
+        return self._resource(index)
+
+    def append(self, resource):
+        """ Adds the values of a full resource of the collection's class. """
+        if not isinstance(resource, self.resource_cls) or resource.is_partial:
+            raise errors.ValidationError(
+                'Expected a full {0} resource.'.format(self.resource_cls.__name__))
+        for name in self._names:
+            self._columns[name].append(resource._get(name))
+        self._length += 1
+
+    def extend(self, resources):
+        for resource in resources:
+            self.append(resource)
+
+    def column(self, name):
+        """ Returns the list of values of a field, which must not be modified. """
+        return self._columns[name]
+
+    def take(self, positions):
+        """ Returns a new collection of the items at the given positions. """
+        return type(self)(self.resource_cls, {
+            name: list(map(values.__getitem__, positions))
+            for name, values in self._columns.items()
+        })
+
+    def iter_response_data(self, fields=None):
+        """
+        Yields an ``OrderedDict`` of the non detail fields of each item, in
+        field declaration order, as :class:`.CollectionResponse` sends them.
+
+        :param fields: Optional field names to limit the data to
+        """
+        names = tuple(name for name, _ in self.resource_cls._collection_fields
+                      if fields is None or name in fields)
+        if not names:
+            for _ in range(len(self)):
+                yield OrderedDict()
+            return
+        columns = [self._columns[name] for name in names]
+        for values in zip(*columns):
+            yield OrderedDict(zip(names, values))
+
+    def _resource(self, index):
+        resource = object.__new__(self.resource_cls)
+        resource._partial = False
+        if self.resource_cls._compact:
+            resource._values = [self._columns[name][index] for name in self._names]
+        else:
+            resource._values = {name: self._columns[name][index] for name in self._names}
+        return resource
@@ -1,9 +1,31 @@
 # -*- coding: utf-8 -*-
 
+import base64
+import datetime
+import heapq
+import json
+
 from collections import OrderedDict
 from operator import attrgetter
 
 from . import errors
+from .datastructures import NotSet
+from .fields import ListField, DictField, SetField, JSONField
+from .serializer import handler
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# heap selection is used when the sort is limited to fewer than
+# 1 / TOP_K_RATIO of the resources
+TOP_K_RATIO = 32
+
+# numeric, date and datetime sort keys of at least this many resources are
+# sorted with numpy when it is installed
+NUMPY_SORT_MIN_SIZE = 1000
 
 
 class Response(object):
@@ -14,6 +36,9 @@ class Response(object):
         }
         self.headers = {}
         self.request = request
+        # the sparse fieldset requested, None for every field
+        self.fields = getattr(request, 'fields', None)
+        self._field_plans = {}
         self.error = None
         self.response_type = None
         self.status_code = self._set_status_code()
@@ -25,6 +50,33 @@ class Response(object):
         ep += str(resource_id)
         self.headers['Location'] = ep
 
+    def set_etag(self, token, weak=False):
+        """
+        Sets the ETag header of the response to a quoted version token.
+
+        :param token: A version token, without quotes
+        :param weak: True for a weak ETag
+        :return: The ETag
+        """
+        etag = '"{0}"'.format(token)
+        if weak:
+            etag = 'W/' + etag
+        self.headers['ETag'] = etag
+        return etag
+
+    def _select_fields(self, resource_cls, pairs):
+        """
+        Narrows the ``(name, key)`` pairs of a resource class to the sparse
+        fieldset of the request, resolved once per class.
+        """
+        if self.fields is None:
+            return pairs
+        plan = self._field_plans.get(resource_cls)
+        if plan is None:
+            plan = self._field_plans[resource_cls] = tuple(
+                pair for pair in pairs if pair[0] in self.fields)
+        return plan
+
     def _set_status_code(self):
         if not self.request:  # Hacky
             return 500
@@ -51,9 +103,18 @@ class DetailResponse(Response):
     def get_response_data(self):
         data = None
         if self.resource:
-            data = OrderedDict(self.resource.sorted_items())
+            data = self.build_resource_data(self.resource)
         return data
 
+    def build_resource_data(self, res):
+        if self.fields is None:
+            return OrderedDict(res.sorted_items())
+        values = res._values
+        return OrderedDict([
+            (name, values[key])
+            for name, key in self._select_fields(type(res), res._sorted_fields)
+        ])
+
 
 class CollectionResponse(Response):
 
@@ -62,6 +123,13 @@ class CollectionResponse(Response):
         self.response_type = 'collection'
         self.resources = []
         self.sort = getattr(self.request.params, 'sort', None)
+        self.cursor = getattr(self.request.params, 'cursor', None)
+        self.cursor_pagination = False
+        # the unique field ordering resources with equal sort values, so a
+        # cursor never falls between them
+        self.cursor_key = 'id'
+        self.sorted = False
+        self.paginated = False
         self.meta['pagination'] = {
             'paginated': False,
             'limit': getattr(self.request.params, 'limit', None),
@@ -69,79 +137,305 @@ class CollectionResponse(Response):
             'record_count': 0,
         }
 
+    def get_sort(self):
+        """
+        Returns the requested sort as a list of ``(field_name, descending)``
+        tuples validated against the resource, or an empty list. With
+        :attr:`cursor_pagination` the ascending :attr:`cursor_key` is added
+        last, unless it is already sorted on. Endpoints applying the sort in
+        their datastore must order by every returned field, including the
+        cursor key, then call :meth:`mark_sorted`.
+        """
+        sort_fields = self._sort_fields()
+        resource_fields = getattr(self.request, 'resource_cls', None)
+        resource_fields = getattr(resource_fields, '_fields', None)
+        for field, _ in sort_fields:
+            if isinstance(resource_fields, dict):
+                self._validate_sort_resource_field(resource_fields, field)
+            elif self.resources:
+                self._validate_sort_field(field)
+        return sort_fields
+
+    def get_pagination(self):
+        """
+        Returns the requested ``(offset, limit)`` as validated ints, or
+        ``(None, None)`` when the request is not paginated. With
+        :attr:`cursor_pagination` and no offset requested, the offset is
+        None and the page starts after the values from :meth:`get_cursor`,
+        a ``sort`` is then required for the page to have a next cursor.
+        Endpoints applying them in their datastore should then call
+        :meth:`mark_paginated`.
+        """
+        pagination = self.meta['pagination']
+        if not self.cursor_pagination and self._has_cursor():
+            raise errors.BadRequestError(
+                '`cursor` is not supported by this endpoint, use `offset`.')
+        if self.cursor_pagination and self._has_cursor():
+            if pagination['offset'] not in (None, NotSet):
+                raise errors.BadRequestError(
+                    'Cannot use both `cursor` and `offset`.')
+            if pagination['limit'] in (None, NotSet):
+                raise errors.BadRequestError(
+                    'A `limit` is required when using a `cursor`.')
+        if (self.cursor_pagination and
+                pagination['offset'] in (None, NotSet) and
+                pagination['limit'] not in (None, NotSet)):
+            if not self.sort:
+                raise errors.BadRequestError(
+                    'A `sort` is required when paginating with a `cursor`.')
+            return None, self._validate_limit()
+        if (pagination['offset'] in (None, NotSet) or
+                pagination['limit'] in (None, NotSet)):
+            return None, None
+        self._validate_offset_and_limit()
+        if pagination['offset'] < 0:
+            raise errors.BadRequestError('Offset cannot be negative.')
+        if pagination['limit'] < 1:
+            raise errors.BadRequestError('Limit must be greater than 1.')
+        return pagination['offset'], pagination['limit']
+
+    def get_cursor(self):
+        """
+        Returns the sort field values of the last resource on the previous
+        page, decoded from the ``cursor`` query parameter and in the same
+        order as :meth:`get_sort`, or None when no cursor was requested.
+        Endpoints return the page of resources sorted after these values and
+        then call :meth:`mark_paginated`.
+        """
+        if not (self.cursor_pagination and self._has_cursor()):
+            return None
+        sort_fields = self.get_sort()
+        if not sort_fields:
+            raise errors.BadRequestError('A `sort` is required when using a '
+                                         '`cursor`.')
+        try:
+            cursor = self.cursor + '=' * (-len(self.cursor) % 4)
+            payload = json.loads(
+                base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+            )
+            sort, values = payload['sort'], payload['values']
+        except (ValueError, TypeError, KeyError):
+            raise errors.BadRequestError('Invalid cursor.')
+        if sort != self.sort or len(values) != len(sort_fields):
+            raise errors.BadRequestError(
+                'Cursor does not match the requested sort.')
+        resource_fields = self._get_resource_fields()
+        if resource_fields is None:
+            return values
+        try:
+            return [resource_fields[field].validate(value, cast=True)
+                    for (field, _), value in zip(sort_fields, values)]
+        except errors.ValidationError:
+            raise errors.BadRequestError('Invalid cursor.')
+
+    def mark_sorted(self):
+        """
+        Indicates the endpoint has already ordered :attr:`resources` as
+        given by :meth:`get_sort`, so they won't be sorted again in memory.
+        """
+        self.get_sort()
+        self.sorted = True
+
+    def mark_paginated(self, total_count=None):
+        """
+        Indicates :attr:`resources` is already the sorted page given by
+        :meth:`get_sort` and :meth:`get_pagination`. The pagination meta is
+        still filled in from the page and the optional total count of
+        records matching the request.
+
+        :param total_count: Optional number of records across all pages
+        """
+        self.mark_sorted()
+        self.get_pagination()
+        self.paginated = True
+        self.meta['pagination']['paginated'] = True
+        if total_count is not None:
+            self.meta['pagination']['total_count'] = total_count
+
     def get_response_data(self):
-        data = []
-        if self.resources:
-            self._sort()
-            self._paginate()
-            for res in self.resources:
-                fields = dict(res.all_fields())
-                field_data = OrderedDict()
-                for key, item in res.sorted_items():
-                    if not fields[key].detail:
-                        field_data[key] = item
-                data.append(field_data)
-        return data
+        return list(self.iter_response_data())
+
+    def iter_response_data(self):
+        """
+        Sorts and paginates the resources immediately, so any errors are
+        raised before a response is started, then returns an iterator which
+        builds the data for each resource as it is consumed.
+        """
+        resources = self.iter_response_resources()
+        if hasattr(self.resources, 'iter_response_data'):
+            return self.resources.iter_response_data(self.fields)
+        return map(self.build_resource_data, resources)
+
+    def iter_response_resources(self):
+        """
+        Sorts and paginates the resources immediately, the same as
+        :meth:`iter_response_data`, then returns an iterator of the
+        resources in the response. Only one of the two may be called.
+        """
+        if not (self.resources or self.paginated):
+            return iter(())
+        self._sort()
+        self._paginate()
+        return iter(self.resources)
+
+    def build_resource_data(self, res):
+        values = res._values
+        return OrderedDict([
+            (name, values[key])
+            for name, key in self._select_fields(type(res), res._collection_fields)
+        ])
 
     def _sort(self):
-        if self.meta['pagination']['paginated']:
+        # pagination set directly in the meta by the endpoint
+        if self.meta['pagination']['paginated'] and not self.paginated:
             return
         if self.sort:
             self.meta['sort'] = self.sort
-            sort_by = self.sort.split(',')
-            for field in reversed(sort_by):
-                field, reverse = self._check_and_strip_first_char(field)
+            if self.sorted:
+                return
+            sort_fields = self._sort_fields()
+            for field, _ in sort_fields:
                 self._validate_sort_field(field)
-                not_sortable, sortable, = [], []
-                for resource in self.resources:
-                    if getattr(resource, field) is None:
-                        not_sortable.append(resource)
-                    else:
-                        sortable.append(resource)
-                sortable.sort(key=attrgetter(field), reverse=reverse)
-                if reverse:
-                    self.resources = sortable + not_sortable
-                else:
-                    self.resources = not_sortable + sortable
+            # only the resources up to the end of the page need ordering
+            offset, limit = self.get_pagination()
+            if offset is not None:
+                limit += offset
+            elif self.get_cursor() is not None:
+                limit = None
+            self.resources = sort_resources(self.resources, sort_fields, limit)
 
     def _paginate(self):
-        if self.meta['pagination']['paginated']:
+        # pagination set directly in the meta by the endpoint
+        if self.meta['pagination']['paginated'] and not self.paginated:
             return
-        if  (self.meta['pagination']['offset'] is None or
-             self.meta['pagination']['limit'] is None):
+        start, limit = self.get_pagination()
+        if limit is None:
             return
-        self._validate_offset_and_limit()
-        if self.meta['pagination']['offset'] < 0:
-            raise errors.BadRequestError('Offset cannot be negative.')
-        if self.meta['pagination']['limit'] < 1:
-            raise errors.BadRequestError('Limit must be greater than 1.')
-        self.meta['offset'] = self.meta['pagination']['offset']
-        self.meta['limit'] = self.meta['pagination']['limit']
-        start = self.meta['offset']
-        end = self.meta['pagination']['offset'] + self.meta['pagination']['limit']
-        self.resources = self.resources[start:end]
+        if start is None:
+            self._paginate_cursor(limit)
+            return
+        self.meta['offset'] = start
+        self.meta['limit'] = limit
+        if not self.paginated:
+            self.resources = self.resources[start:start + limit]
         self.meta['pagination']['record_count'] = len(self.resources)
         self.meta['pagination']['next_page'] = start + len(self.resources)
 
+    def _paginate_cursor(self, limit):
+        pagination = self.meta['pagination']
+        self.meta['limit'] = limit
+        if not self.paginated:
+            cursor_values = self.get_cursor()
+            start = 0
+            if cursor_values is not None:
+                start = self._find_cursor_position(cursor_values)
+            self.resources = self.resources[start:start + limit]
+        pagination['cursor'] = self.cursor if self._has_cursor() else None
+        pagination['record_count'] = len(self.resources)
+        pagination['next_cursor'] = None
+        if len(self.resources) == limit:
+            pagination['next_cursor'] = self._encode_cursor(self.resources[-1])
+
+    def _has_cursor(self):
+        # a cursor is always a query string value
+        return isinstance(self.cursor, str) and self.cursor != ''
+
+    def _encode_cursor(self, resource):
+        values = [getattr(resource, field) for field, _ in self._sort_fields()]
+        payload = json.dumps({'sort': self.sort, 'values': values},
+                             default=handler, separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(payload.encode('utf-8'))
+        return cursor.decode('ascii').rstrip('=')
+
+    def _find_cursor_position(self, cursor_values):
+        """ Returns the index of the first sorted resource after the cursor. """
+        sort_fields = self._sort_fields()
+        cursor_keys = [(value is not None, value) for value in cursor_values]
+        for index, resource in enumerate(self.resources):
+            for (field, descending), cursor_key in zip(sort_fields, cursor_keys):
+                value = getattr(resource, field)
+                key = (value is not None, value)
+                if key != cursor_key:
+                    if (key < cursor_key) == descending:
+                        return index
+                    break
+        return len(self.resources)
+
+    def _get_resource_fields(self):
+        resource_cls = getattr(self.request, 'resource_cls', None)
+        resource_fields = getattr(resource_cls, '_fields', None)
+        if not isinstance(resource_fields, dict) and self.resources:
+            resource_fields = getattr(self.resources[0], '_fields', None)
+        return resource_fields if isinstance(resource_fields, dict) else None
+
+    def _sort_fields(self):
+        sort_fields = self._parse_sort()
+        if (sort_fields and self.cursor_pagination and self.cursor_key and
+                self.cursor_key not in (field for field, _ in sort_fields)):
+            sort_fields.append((self.cursor_key, False))
+        return sort_fields
+
+    def _parse_sort(self):
+        if not self.sort:
+            return []
+        return [self._check_and_strip_first_char(field)
+                for field in self.sort.split(',')]
+
     def _check_and_strip_first_char(self, field):
         reverse = field.startswith('-')
         field = field.lstrip('+-')
         return field, reverse
 
     def _validate_sort_field(self, field):
-        if not hasattr(self.resources[0], field):
+        # columnar collections are sorted from their field columns, so any
+        # other attribute of their resources can't be sorted on
+        resource_cls = getattr(self.resources, 'resource_cls', None)
+        if resource_cls is not None:
+            self._validate_sort_resource_field(resource_cls._fields, field)
+            return
+        try:
+            value = getattr(self.resources[0], field)
+        except AttributeError:
             raise errors.BadRequestError(
                 'Cannot sort by field `{}`. It does not exist in the resource.'
                 .format(field)
             )
-        elif (isinstance(getattr(self.resources[0], field), dict) or
-              isinstance(getattr(self.resources[0], field), list) or
-              isinstance(getattr(self.resources[0], field), set)):
+        if isinstance(value, (dict, list, set)):
             raise errors.BadRequestError(
                 'Cannot sort by field `{}`. Field type is not sortable.'
                 .format(field)
             )
 
+    @staticmethod
+    def _validate_sort_resource_field(resource_fields, field):
+        resource_field = resource_fields.get(field)
+        if resource_field is None:
+            raise errors.BadRequestError(
+                'Cannot sort by field `{}`. It does not exist in the resource.'
+                .format(field)
+            )
+        elif isinstance(resource_field,
+                        (ListField, DictField, SetField, JSONField)):
+            raise errors.BadRequestError(
+                'Cannot sort by field `{}`. Field type is not sortable.'
+                .format(field)
+            )
+
+    def _validate_limit(self):
+        pagination = self.meta['pagination']
+        try:
+            if isinstance(pagination['limit'], bool):
+                raise TypeError
+            pagination['limit'] = int(pagination['limit'])
+        except (ValueError, TypeError):
+            raise errors.BadRequestError(
+                '`limit` must be a valid number. Could not cast limit of '
+                '`{0}`.'.format(pagination['limit'])
+            )
+        if pagination['limit'] < 1:
+            raise errors.BadRequestError('Limit must be greater than 1.')
+        return pagination['limit']
+
     def _validate_offset_and_limit(self):
         try:
             pagin = self.meta['pagination']
@@ -163,6 +457,160 @@ class CollectionResponse(Response):
             )
 
 
+def sort_resources(resources, sort_fields, limit=None):
+    """
+    Returns the resources sorted by a list of ``(field_name, descending)``
+    tuples. For each field, None values are placed first when ascending and
+    last when descending, and equal resources keep their original order.
+
+    Each field is read once per resource into a column of keys, then the
+    resource positions are sorted with one stable pass per field, least
+    significant first, so all comparisons are done in C on plain values
+    with None values partitioned out beforehand.
+
+    :param limit: Optional number of resources to return from the start of
+        the sorted order. When small relative to the number of resources
+        only the candidates for those positions are sorted.
+
+    A :class:`.ResourceCollection` is sorted from its columns and returned
+    as a new collection.
+    """
+    if limit is not None and 0 < limit * TOP_K_RATIO <= len(resources):
+        return _select_resources(resources, sort_fields, limit)
+
+    if numpy is not None and len(resources) >= NUMPY_SORT_MIN_SIZE:
+        order = _numpy_order(resources, sort_fields)
+        if order is not None:
+            if limit is not None:
+                del order[limit:]
+            return _take(resources, order)
+
+    order = list(range(len(resources)))
+    for field, descending in reversed(sort_fields):
+        keys = _key_column(resources, field)
+        if None in keys:
+            nones = [index for index in order if keys[index] is None]
+            order = [index for index in order if keys[index] is not None]
+            order.sort(key=keys.__getitem__, reverse=descending)
+            order = order + nones if descending else nones + order
+        else:
+            order.sort(key=keys.__getitem__, reverse=descending)
+    if limit is not None:
+        del order[limit:]
+    return _take(resources, order)
+
+
+def _select_resources(resources, sort_fields, limit):
+    """
+    Finds the key of the first sort field at position ``limit`` with a heap,
+    then sorts only the resources up to and including that key.
+    """
+    field, descending = sort_fields[0]
+    keys = _key_column(resources, field)
+    if None in keys:
+        keys = [(value is not None, value) for value in keys]
+
+    # heapq's selections are stable, nlargest matching a reversed sort
+    select = heapq.nlargest if descending else heapq.nsmallest
+    boundary = keys[select(limit, range(len(keys)), key=keys.__getitem__)[-1]]
+    if descending:
+        candidates = [index for index, key in enumerate(keys) if key >= boundary]
+    else:
+        candidates = [index for index, key in enumerate(keys) if key <= boundary]
+    return sort_resources(_take(resources, candidates), sort_fields)[:limit]
+
+
+def _numpy_order(resources, sort_fields):
+    """
+    Returns the sorted positions of the resources using ``numpy.lexsort``,
+    or None if a sort field has values other than numbers, dates or
+    datetimes. Each field contributes its values, negated when descending,
+    and if it has None values a more significant key placing them first
+    when ascending and last when descending, matching :func:`sort_resources`.
+    """
+    keys = []
+    for field, descending in reversed(sort_fields):
+        column = _key_column(resources, field)
+        has_none = None in column
+        values = _numpy_key_array(column, has_none)
+        if values is None:
+            return None
+        keys.append(-values if descending else values)
+        if has_none:
+            nulls = numpy.fromiter(map(_is_none, column), dtype=bool,
+                                   count=len(column))
+            keys.append(nulls if descending else ~nulls)
+    return numpy.lexsort(keys).tolist()
+
+
+def _numpy_key_array(column, has_none):
+    """
+    Converts a column of sort keys to an int64 or float64 array with None
+    values as zero, or returns None if the values cannot be ordered exactly
+    that way.
+    """
+    types = set(map(type, column))
+    types.discard(type(None))
+    if not types:
+        return numpy.zeros(len(column), dtype='int64')
+    if len(types) != 1:
+        if not types <= {int, float}:
+            return None
+        # ints are only exact as floats up to 2 ** 53
+        if any(type(value) is int and abs(value) > 2 ** 53 for value in column):
+            return None
+        types = {float}
+
+    value_type = types.pop()
+    if value_type is datetime.datetime:
+        if any(value is not None and value.tzinfo is not None for value in column):
+            return None
+        # converting through datetime64 is several times slower
+        epoch = datetime.datetime(1970, 1, 1)
+        microsecond = datetime.timedelta(microseconds=1)
+        values = ((value - epoch) // microsecond if value is not None else 0
+                  for value in column)
+        return numpy.fromiter(values, dtype='int64', count=len(column))
+    if value_type is datetime.date:
+        values = (value.toordinal() if value is not None else 0
+                  for value in column)
+        return numpy.fromiter(values, dtype='int64', count=len(column))
+    if value_type not in (int, float):
+        return None
+
+    if has_none:
+        column = [0 if value is None else value for value in column]
+    if value_type is int:
+        try:
+            values = numpy.array(column, dtype='int64')
+        except OverflowError:
+            return None
+        # the minimum int64 cannot be negated
+        if values.min() == numpy.iinfo('int64').min:
+            return None
+        return values
+    values = numpy.array(column, dtype='float64')
+    if numpy.isnan(values).any():
+        return None
+    return values
+
+
+def _is_none(value):
+    return value is None
+
+
+def _key_column(resources, field):
+    if hasattr(resources, 'column'):
+        return resources.column(field)
+    return list(map(attrgetter(field), resources))
+
+
+def _take(resources, positions):
+    if hasattr(resources, 'take'):
+        return resources.take(positions)
+    return [resources[index] for index in positions]
+
+
 class ErrorResponse(Response):
 
     def __init__(self, http_error, *args, **kwargs):
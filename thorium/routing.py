@@ -7,10 +7,41 @@
 
 """
 
+import re
+import uuid
+
 from . import dispatcher
 from .resources import ResourceMetaClass
 
 
+# regex and conversion function for each supported url variable converter,
+# following the werkzeug converters used by Flask
+CONVERTERS = {
+    'default': (r'[^/]+', str),
+    'string': (r'[^/]+', str),
+    'int': (r'\d+', int),
+    'float': (r'\d+\.\d+', float),
+    'path': (r'[^/].*?', str),
+    'uuid': (r'[A-Fa-f0-9]{8}-[A-Fa-f0-9]{4}-[A-Fa-f0-9]{4}-[A-Fa-f0-9]{4}-[A-Fa-f0-9]{12}',
+             uuid.UUID),
+}
+
+# the order url variables are tried in at a path segment, as werkzeug sorts
+# its rules: numbers and uuids before strings, paths spanning segments last
+CONVERTER_WEIGHTS = {
+    'int': 0,
+    'float': 0,
+    'uuid': 0,
+    'default': 1,
+    'string': 1,
+    'path': 2,
+}
+
+_VARIABLE_RE = re.compile(
+    r'<(?:(?P<converter>[a-zA-Z_][a-zA-Z0-9_]*):)?(?P<variable>[a-zA-Z_][a-zA-Z0-9_]*)>'
+)
+
+
 class Route(object):
     """ An object to hold the relationship between a url path and the
     dispatcher that handles requests to that path.
@@ -36,6 +67,7 @@ class RouteManager(object):
 
     def __init__(self):
         self._routes = []
+        self._trie = None
 
     def add_route(self, route):
         """
@@ -50,6 +82,19 @@ class RouteManager(object):
 
         return self._routes
 
+    def match(self, path):
+        """
+        Finds the first :class:`.Route` matching a url path.
+
+        :param path: The url path of a request
+        :return: A tuple of the matching route and its url variables, or
+            ``(None, None)`` when no route matches
+        """
+        # rebuilt when routes have been added since the last match
+        if self._trie is None or self._trie.size != len(self._routes):
+            self._trie = RouteTrie(self._routes)
+        return self._trie.match(path)
+
     def collection(self, path, methods, parameters_cls=None):
         def wrapped(cls):
             route = build_route(dispatcher.CollectionDispatcher,
@@ -92,3 +137,123 @@ def build_route(dispatcher_cls, endpoint_cls, parameters_cls, path, methods):
                   path=path,
                   dispatcher=dsp)
     return route
+
+
+class RouteTrie(object):
+    """
+    Matches url paths against a set of :class:`.Route`'s by walking a tree of
+    their path segments, so the cost of a match depends on the depth of the
+    path rather than on the number of routes. At each segment static text is
+    preferred over url variables, which are tried by the weight of their
+    converters in :data:`CONVERTER_WEIGHTS`, then in the order their routes
+    were added.
+
+    :param routes: The :class:`.Route`'s to match
+    """
+
+    def __init__(self, routes):
+        self.size = len(routes)
+        self._root = _TrieNode()
+        for route in routes:
+            if route.path:
+                self.insert(route)
+
+    def insert(self, route):
+        node = self._root
+        segments = route.path.split('/')
+        for index, segment in enumerate(segments):
+            if '<' not in segment:
+                node = node.static.setdefault(segment, _TrieNode())
+                continue
+            pattern, converters = _rule_pattern(segment)
+            if 'path' in (m.group('converter') for m in _VARIABLE_RE.finditer(segment)):
+                # path variables span segments, match the rest of the rule at once
+                pattern, converters = _rule_pattern('/'.join(segments[index:]))
+                node.tails.append((re.compile(pattern), converters, route))
+                return
+            for _, existing, _, child in node.dynamic:
+                if existing.pattern == pattern:
+                    node = child
+                    break
+            else:
+                child = _TrieNode()
+                weight = max(CONVERTER_WEIGHTS[m.group('converter') or 'default']
+                             for m in _VARIABLE_RE.finditer(segment))
+                node.dynamic.append((weight, re.compile(pattern), converters, child))
+                # a stable sort keeps the insertion order of equal weights
+                node.dynamic.sort(key=lambda entry: entry[0])
+                node = child
+        if node.route is None:
+            node.route = route
+
+    def match(self, path):
+        """
+        :param path: The url path of a request
+        :return: A tuple of the matching route and its url variables, or
+            ``(None, None)`` when no route matches
+        """
+        view_args = {}
+        route = self._match(self._root, path.split('/'), 0, view_args)
+        if route is None:
+            return None, None
+        return route, view_args
+
+    def _match(self, node, segments, index, view_args):
+        if index == len(segments):
+            return node.route
+
+        segment = segments[index]
+        child = node.static.get(segment)
+        if child is not None:
+            route = self._match(child, segments, index + 1, view_args)
+            if route is not None:
+                return route
+
+        for _, pattern, converters, child in node.dynamic:
+            m = pattern.fullmatch(segment)
+            if m is not None:
+                route = self._match(child, segments, index + 1, view_args)
+                if route is not None:
+                    _convert(m, converters, view_args)
+                    return route
+
+        if node.tails:
+            rest = '/'.join(segments[index:])
+            for pattern, converters, route in node.tails:
+                m = pattern.fullmatch(rest)
+                if m is not None:
+                    _convert(m, converters, view_args)
+                    return route
+        return None
+
+
+class _TrieNode(object):
+    __slots__ = ('static', 'dynamic', 'tails', 'route')
+
+    def __init__(self):
+        self.static = {}
+        self.dynamic = []
+        self.tails = []
+        self.route = None
+
+
+def _convert(m, converters, view_args):
+    for name, value in m.groupdict().items():
+        view_args[name] = converters[name](value)
+
+
+def _rule_pattern(rule):
+    pattern = ''
+    converters = {}
+    position = 0
+    for m in _VARIABLE_RE.finditer(rule):
+        converter = m.group('converter') or 'default'
+        if converter not in CONVERTERS:
+            raise Exception('Unknown url converter {0} in path {1}'.format(converter, rule))
+        regex, converters[m.group('variable')] = CONVERTERS[converter]
+        pattern += re.escape(rule[position:m.start()])
+        pattern += '(?P<{0}>{1})'.format(m.group('variable'), regex)
+        position = m.end()
+    pattern += re.escape(rule[position:])
+    return pattern, converters
+
@@ -3,24 +3,26 @@
 import json
 import uuid
 
-from datetime import datetime
-
-import arrow
+from datetime import datetime, timezone
 
 from collections import OrderedDict
 
 from .datastructures import NotSet
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class SerializerBase(object):
 
+    # approximate number of bytes buffered before a chunk is yielded by
+    # serialize_response_stream
+    stream_chunk_size = 16384
+
     def serialize_response(self, response):
-        meta = response.meta
-        if meta['pagination'] is not None:
-            if meta['pagination']['limit'] is NotSet:
-                meta['pagination']['limit'] = None
-            if meta['pagination']['offset'] is NotSet:
-                meta['pagination']['offset'] = None
+        meta = self._normalize_meta(response.meta)
         body = self._build_envelope(response_type=response.response_type,
                                     status=response.status_code,
                                     error=response.error,
@@ -28,13 +30,60 @@ class SerializerBase(object):
                                     params=getattr(response, 'params', None),
                                     data=response.get_response_data(),
                                     meta=meta)
+        self._remove_paginated_flag(body['meta'])
+        serialized_body = self._serialize_data(body)
+        return serialized_body
+
+    def serialize_response_stream(self, response):
+        """
+        Serializes a response as an iterator of utf-8 encoded byte chunks.
+        For responses providing ``iter_response_data`` the envelope is
+        written first and each resource is serialized only as the iterator
+        is consumed, otherwise the full body is returned as a single chunk.
+        The joined chunks are identical to :meth:`serialize_response`.
+
+        Sorting and pagination happen before this method returns, so request
+        errors are raised before any part of the body is produced.
+        """
+        if not hasattr(response, 'iter_response_data'):
+            return iter((self.serialize_response(response).encode('utf-8'),))
+
+        meta = self._normalize_meta(response.meta)
+        rows = response.iter_response_data()
+        self._remove_paginated_flag(meta)
+        head = self._build_envelope(response_type=response.response_type,
+                                    status=response.status_code,
+                                    error=response.error,
+                                    code=getattr(response, 'code', None),
+                                    params=getattr(response, 'params', None),
+                                    data=None,
+                                    meta=None)
+        del head['data']
+        del head['meta']
+        return self._stream_envelope(head, rows, meta)
+
+    def _stream_envelope(self, head, rows, meta):
+        # without a format specific implementation the body is built whole
+        head['data'] = list(rows)
+        head['meta'] = meta
+        yield self._serialize_data(head).encode('utf-8')
+
+    @staticmethod
+    def _normalize_meta(meta):
+        if meta['pagination'] is not None:
+            if meta['pagination']['limit'] is NotSet:
+                meta['pagination']['limit'] = None
+            if meta['pagination']['offset'] is NotSet:
+                meta['pagination']['offset'] = None
+        return meta
+
+    @staticmethod
+    def _remove_paginated_flag(meta):
         # Remove paginated flag because no longer needed
         try:
-            del body['meta']['pagination']['paginated']
+            del meta['pagination']['paginated']
         except (TypeError, KeyError):
             pass
-        serialized_body = self._serialize_data(body)
-        return serialized_body
 
     @staticmethod
     def _build_envelope(response_type, status, error, code, params, data, meta):
@@ -59,16 +108,183 @@ class SerializerBase(object):
         raise NotImplementedError(err_msg)
 
 
+class JsonBackend(object):
+    """
+    Encodes data to a JSON string using the standard library. Backends for
+    other JSON libraries subclass this and override :meth:`dumps`,
+    :meth:`loads` and the separators, which :class:`JsonSerializer` uses
+    when streaming.
+    """
+    item_separator = ', '
+    key_separator = ': '
+
+    def dumps(self, data):
+        return json.dumps(data, default=handler)
+
+    def loads(self, body):
+        """ Parses a request body, either bytes or a string. """
+        if isinstance(body, bytes):
+            body = body.decode('utf-8')
+        return json.loads(body)
+
+
+class OrjsonBackend(JsonBackend):
+    """
+    Encodes data using orjson, which handles datetime, date, time and UUID
+    values natively with the same output as :func:`handler`. It is only used
+    when given explicitly, as its output differs from :class:`JsonBackend`:
+    it uses compact separators, is not ascii escaped, writes floats in their
+    shortest form, such as ``1e16`` rather than ``1e+16``, and writes NaN and
+    Infinity as ``null`` rather than the invalid ``NaN`` and ``Infinity``.
+    When parsing it rejects ``NaN`` and ``Infinity``, and reads integers over
+    64 bits as floats.
+    """
+    item_separator = ','
+    key_separator = ':'
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError('orjson must be installed to use OrjsonBackend')
+        self._option = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, data):
+        try:
+            return orjson.dumps(data, default=handler,
+                                option=self._option).decode('utf-8')
+        except orjson.JSONEncodeError:
+            # values orjson rejects outright, such as times with a tzinfo or
+            # integers over 64 bits, are encoded by the standard library in
+            # the same compact format
+            return json.dumps(data, default=handler, ensure_ascii=False,
+                              separators=(self.item_separator,
+                                          self.key_separator))
+
+    def loads(self, body):
+        return orjson.loads(body)
+
+
 class JsonSerializer(SerializerBase):
+    """
+    :param backend: An optional :class:`JsonBackend`, defaults to the
+        standard library :class:`JsonBackend`.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or JsonBackend()
+
+    def serialize_response(self, response):
+        if not has_frozen_resources(response):
+            return super().serialize_response(response)
+        return ''.join(self._frozen_envelope(response))
+
+    def serialize_response_stream(self, response):
+        if not has_frozen_resources(response):
+            return super().serialize_response_stream(response)
+        return (chunk.encode('utf-8') for chunk in self._frozen_envelope(response))
 
     def _serialize_data(self, data):
-        return json.dumps(data, default=handler)
+        return self.backend.dumps(data)
+
+    def _stream_envelope(self, head, rows, meta):
+        data = self._iter_list(map(self._serialize_data, rows))
+        for chunk in self._iter_envelope(head, data, meta):
+            yield chunk.encode('utf-8')
+
+    def _frozen_envelope(self, response):
+        """
+        Returns an iterator of the body of a response holding resources with
+        ``_frozen`` set, splicing the cached json of each resource into the
+        envelope. The response is sorted and paginated before returning.
+        """
+        meta = self._normalize_meta(response.meta)
+        if hasattr(response, 'iter_response_resources'):
+            resources = response.iter_response_resources()
+            data = self._iter_list(
+                self._serialize_resource(res, response.build_resource_data,
+                                         False, response.fields)
+                for res in resources
+            )
+        else:
+            data = (self._serialize_resource(response.resource,
+                                             response.build_resource_data,
+                                             True, response.fields),)
+        self._remove_paginated_flag(meta)
+        head = self._build_envelope(response_type=response.response_type,
+                                    status=response.status_code,
+                                    error=response.error,
+                                    code=getattr(response, 'code', None),
+                                    params=getattr(response, 'params', None),
+                                    data=None,
+                                    meta=None)
+        del head['data']
+        del head['meta']
+        return self._iter_envelope(head, data, meta)
+
+    def _serialize_resource(self, resource, build_resource_data, detail, fields):
+        # sparse fieldsets are chosen by the client, caching each of them
+        # would let requests grow a resource's cache without bound
+        if fields is not None or not getattr(resource, '_frozen', False):
+            return self._serialize_data(build_resource_data(resource))
+        # detail and collection responses include different fields, and
+        # backends differ in their separators
+        key = (type(self.backend), detail)
+        cache = getattr(resource, '_serialized', None)
+        if cache is None:
+            cache = resource._serialized = {}
+        serialized = cache.get(key)
+        if serialized is None:
+            serialized = cache[key] = self._serialize_data(
+                build_resource_data(resource))
+        return serialized
+
+    def _iter_list(self, serialized_items):
+        yield '['
+        separator = self.backend.item_separator
+        for index, item in enumerate(serialized_items):
+            if index:
+                yield separator
+            yield item
+        yield ']'
+
+    def _iter_envelope(self, head, data, meta):
+        # the envelope without data or meta ends with a closing brace which is
+        # replaced by the serialized data, matching the output of the backend
+        item_sep = self.backend.item_separator
+        key_sep = self.backend.key_separator
+        chunk = [self._serialize_data(head)[:-1], item_sep, '"data"', key_sep]
+        chunk_length = 0
+        for part in data:
+            chunk.append(part)
+            chunk_length += len(part)
+            if chunk_length >= self.stream_chunk_size:
+                yield ''.join(chunk)
+                chunk = []
+                chunk_length = 0
+        chunk.extend([item_sep, '"meta"', key_sep])
+        chunk.append(self._serialize_data(meta))
+        chunk.append('}')
+        yield ''.join(chunk)
+
+
+def has_frozen_resources(response):
+    """
+    Whether the resources of a response have ``_frozen`` set, judged by the
+    first resource of a collection. Columnar collections are never frozen.
+    """
+    resource = getattr(response, 'resource', None)
+    if resource is not None:
+        return getattr(resource, '_frozen', False)
+    resources = getattr(response, 'resources', None)
+    if isinstance(resources, list) and resources:
+        return getattr(resources[0], '_frozen', False)
+    return False
 
 
 def handler(obj):
     if hasattr(obj, 'isoformat'):
-        if isinstance(obj, datetime):
-            obj = arrow.get(obj)
+        # naive datetimes are treated as utc
+        if isinstance(obj, datetime) and obj.tzinfo is None:
+            obj = obj.replace(tzinfo=timezone.utc)
         return obj.isoformat()
     elif isinstance(obj, uuid.UUID):
         return str(obj)
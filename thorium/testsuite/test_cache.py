@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+
+from unittest import TestCase, mock
+
+from thorium import (Endpoint, LocalResponseCache, Request, Resource,
+                     ResponseCache, errors, fields)
+from thorium.dispatcher import CollectionDispatcher, DetailDispatcher
+
+
+class DictResponseCache(ResponseCache):
+    """ Stands in for an external store, ignoring expiry. """
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ttl=None):
+        self.store[key] = value
+
+
+class TestLocalResponseCache(TestCase):
+
+    def setUp(self):
+        self.cache = LocalResponseCache(maxsize=2)
+
+    def test_get_set(self):
+        self.assertIsNone(self.cache.get('a'))
+        self.cache.set('a', 1)
+        self.assertEqual(self.cache.get('a'), 1)
+
+    def test_least_recently_used_evicted(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('a'), 1)
+
+    def test_ttl(self):
+        with mock.patch('thorium.cache.time.monotonic', return_value=100.0):
+            self.cache.set('a', 1, ttl=10)
+        with mock.patch('thorium.cache.time.monotonic', return_value=109.0):
+            self.assertEqual(self.cache.get('a'), 1)
+        with mock.patch('thorium.cache.time.monotonic', return_value=110.0):
+            self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_invalidate(self):
+        cache = LocalResponseCache()
+        key = cache.key('people', 'abc')
+        self.assertEqual(cache.key('people', 'abc'), key)
+        other = cache.key('places', 'abc')
+        cache.set(key, 1)
+        cache.set(other, 2)
+        cache.invalidate('people')
+        self.assertNotEqual(cache.key('people', 'abc'), key)
+        self.assertIsNone(cache.get(cache.key('people', 'abc')))
+        self.assertEqual(cache.get(cache.key('places', 'abc')), 2)
+
+    def test_lost_generation_misses(self):
+        key = self.cache.key('people', 'abc')
+        self.cache.set(key, 1)
+        self.cache.clear()
+        self.assertNotEqual(self.cache.key('people', 'abc'), key)
+
+
+class PersonResource(Resource):
+    id = fields.IntField()
+    name = fields.CharField()
+
+
+class Store(object):
+    calls = 0
+    name = 'Timmy'
+
+
+class CachedEndpoint(Endpoint):
+    Resource = PersonResource
+    _authenticator_classes = None
+    response_cache = LocalResponseCache()
+
+    def cache_scope(self):
+        return ''
+
+    def get_detail(self):
+        Store.calls += 1
+        self.response.resource = PersonResource(
+            id=self.request.identifiers['id'], name=Store.name)
+
+    def get_collection(self):
+        Store.calls += 1
+        self.response.resources = [PersonResource(id=1, name=Store.name)]
+
+    def put_detail(self):
+        Store.name = self.request.resource['name']
+        self.invalidate_cache()
+        self.response.resource = PersonResource(
+            id=self.request.identifiers['id'], name=Store.name)
+
+
+class PeopleEndpoint(Endpoint):
+    Resource = PersonResource
+    _authenticator_classes = None
+    response_cache = CachedEndpoint.response_cache
+
+    def cache_scope(self):
+        return ''
+
+    def get_collection(self):
+        Store.calls += 1
+        self.response.resources = [PersonResource(id=1, name=Store.name)]
+
+
+class UnscopedEndpoint(CachedEndpoint):
+
+    def cache_scope(self):
+        return Endpoint.cache_scope(self)
+
+    def pre_request_detail(self):
+        if self.request.identifiers['id'] == 2:
+            raise errors.ResourceNotFoundError()
+
+
+class ExternalCachedEndpoint(CachedEndpoint):
+    response_cache = DictResponseCache()
+    etag_response = True
+
+
+class ScopedEndpoint(CachedEndpoint):
+
+    def cache_scope(self):
+        return self.request.identifiers.get('account')
+
+
+class TestDispatcherResponseCache(TestCase):
+
+    def setUp(self):
+        Store.calls = 0
+        Store.name = 'Timmy'
+        CachedEndpoint.response_cache.clear()
+
+    def dispatch(self, endpoint_cls, identifiers, method='GET', params=None,
+                 resource=None, headers=None, dispatcher_cls=DetailDispatcher):
+        dispatcher = dispatcher_cls(endpoint_cls=endpoint_cls,
+                                    resource_cls=PersonResource,
+                                    parameters_cls=None,
+                                    allowed_methods={'get', 'put'})
+        request = Request(dispatcher, method, identifiers, params, None,
+                          resource, [], '/', headers=headers)
+        return dispatcher.dispatch(request)
+
+    def test_hit_skips_endpoint(self):
+        first = self.dispatch(CachedEndpoint, {'id': 1})
+        second = self.dispatch(CachedEndpoint, {'id': 1})
+        self.assertEqual(Store.calls, 1)
+        self.assertEqual(first[1], second[1])
+        self.assertEqual(second[0].status_code, 200)
+
+    def test_keyed_on_identifiers_and_params(self):
+        self.dispatch(CachedEndpoint, {'id': 1})
+        self.dispatch(CachedEndpoint, {'id': 2})
+        self.dispatch(CachedEndpoint, {'id': 1}, params={'times': 2})
+        self.dispatch(CachedEndpoint, {'id': 1}, params={'times': 2})
+        self.assertEqual(Store.calls, 3)
+
+    def test_keyed_on_request_type(self):
+        self.dispatch(CachedEndpoint, {'id': 1})
+        self.dispatch(CachedEndpoint, {'id': 1}, dispatcher_cls=CollectionDispatcher)
+        self.dispatch(CachedEndpoint, {'id': 1}, dispatcher_cls=CollectionDispatcher)
+        self.assertEqual(Store.calls, 2)
+
+    def test_invalidated_by_write(self):
+        self.dispatch(CachedEndpoint, {'id': 1})
+        self.dispatch(CachedEndpoint, {'id': 1}, method='PUT',
+                      resource={'name': 'Jim'})
+        response, body = self.dispatch(CachedEndpoint, {'id': 1})
+        self.assertEqual(Store.calls, 2)
+        self.assertIn('Jim', body)
+
+    def test_write_invalidates_other_endpoints(self):
+        self.assertEqual(PeopleEndpoint.get_cache_namespace(),
+                         CachedEndpoint.get_cache_namespace())
+        self.dispatch(PeopleEndpoint, {}, dispatcher_cls=CollectionDispatcher)
+        self.dispatch(CachedEndpoint, {'id': 1}, method='PUT',
+                      resource={'name': 'Jim'})
+        response, body = self.dispatch(PeopleEndpoint, {},
+                                       dispatcher_cls=CollectionDispatcher)
+        self.assertEqual(Store.calls, 2)
+        self.assertIn('Jim', body)
+
+    def test_scope(self):
+        self.dispatch(ScopedEndpoint, {'id': 1, 'account': 'a'})
+        self.dispatch(ScopedEndpoint, {'id': 1, 'account': 'b'})
+        self.dispatch(ScopedEndpoint, {'id': 1, 'account': 'a'})
+        self.assertEqual(Store.calls, 2)
+        # no scope, no cache
+        self.dispatch(ScopedEndpoint, {'id': 1})
+        self.dispatch(ScopedEndpoint, {'id': 1})
+        self.assertEqual(Store.calls, 4)
+
+    def test_no_scope_by_default(self):
+        self.dispatch(UnscopedEndpoint, {'id': 1})
+        self.dispatch(UnscopedEndpoint, {'id': 1})
+        self.assertEqual(Store.calls, 2)
+        # the pre_request hook runs on every request
+        for _ in range(2):
+            self.assertRaises(errors.ResourceNotFoundError, self.dispatch,
+                              UnscopedEndpoint, {'id': 2})
+
+    def test_external_store_with_etag(self):
+        response, body = self.dispatch(ExternalCachedEndpoint, {'id': 1})
+        etag = response.headers['ETag']
+        response, body = self.dispatch(ExternalCachedEndpoint, {'id': 1},
+                                       headers={'if-none-match': etag})
+        self.assertEqual(Store.calls, 1)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(body, '')
+        self.assertEqual(response.headers['ETag'], etag)
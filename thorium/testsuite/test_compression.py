@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+import gzip
+import unittest
+
+from unittest import mock
+
+from thorium import compression
+from thorium.compression import Compressor, brotli, negotiate_encoding
+
+
+class TestNegotiateEncoding(unittest.TestCase):
+
+    def test_no_header(self):
+        self.assertIsNone(negotiate_encoding(None))
+        self.assertIsNone(negotiate_encoding(''))
+        self.assertIsNone(negotiate_encoding('identity'))
+
+    def test_gzip(self):
+        self.assertEqual(negotiate_encoding('gzip, deflate'), 'gzip')
+        self.assertEqual(negotiate_encoding('GZIP;q=0.5'), 'gzip')
+
+    def test_quality(self):
+        self.assertIsNone(negotiate_encoding('gzip;q=0'))
+        self.assertIsNone(negotiate_encoding('*;q=0'))
+        self.assertEqual(negotiate_encoding('*'), 'br' if brotli else 'gzip')
+        self.assertEqual(negotiate_encoding('br;q=0.1, gzip;q=0.9'), 'gzip')
+
+    def test_brotli_preferred(self):
+        with mock.patch.object(compression, 'brotli', mock.MagicMock()):
+            self.assertEqual(negotiate_encoding('gzip, deflate, br'), 'br')
+        with mock.patch.object(compression, 'brotli', None):
+            self.assertEqual(negotiate_encoding('gzip, deflate, br'), 'gzip')
+            self.assertIsNone(negotiate_encoding('br'))
+
+
+class TestCompressor(unittest.TestCase):
+
+    def setUp(self):
+        self.compressor = Compressor(min_size=100)
+        self.body = '{"data": [' + ', '.join(['{"id": 1}'] * 50) + ']}'
+
+    def test_gzip(self):
+        body, headers = self.compressor.compress_response(
+            self.body, {'ETag': '"abc"'}, 'gzip')
+        self.assertEqual(gzip.decompress(body).decode('utf-8'), self.body)
+        self.assertLess(len(body), len(self.body))
+        self.assertEqual(headers, {'ETag': 'W/"abc"',
+                                   'Content-Encoding': 'gzip',
+                                   'Vary': 'Accept-Encoding'})
+
+    def test_below_min_size(self):
+        body, headers = self.compressor.compress_response(
+            '{"data": null}', {'Vary': 'Origin'}, 'gzip')
+        self.assertEqual(body, b'{"data": null}')
+        self.assertEqual(headers, {'Vary': 'Origin, Accept-Encoding'})
+
+    def test_empty_body(self):
+        compressor = Compressor(min_size=0)
+        body, headers = compressor.compress_response('', {'ETag': '"abc"'}, 'gzip')
+        self.assertEqual(body, b'')
+        self.assertEqual(headers, {'ETag': 'W/"abc"', 'Vary': 'Accept-Encoding'})
+
+    def test_no_body_status(self):
+        for status_code in (204, 304):
+            body, headers = self.compressor.compress_response(
+                self.body, {'ETag': '"abc"'}, 'gzip', status_code)
+            self.assertEqual(body, self.body)
+            self.assertEqual(headers, {'ETag': 'W/"abc"',
+                                       'Vary': 'Accept-Encoding'})
+
+    def test_below_min_size_etag(self):
+        body, headers = self.compressor.compress_response(
+            '{"data": null}', {'ETag': '"abc"'}, 'gzip')
+        self.assertEqual(headers['ETag'], 'W/"abc"')
+        body, headers = self.compressor.compress_response(
+            '{"data": null}', {'ETag': '"abc"'}, None)
+        self.assertEqual(headers['ETag'], '"abc"')
+
+    def test_not_accepted(self):
+        body, headers = self.compressor.compress_response(self.body, {}, None)
+        self.assertEqual(body, self.body)
+        self.assertEqual(headers, {'Vary': 'Accept-Encoding'})
+
+    def test_headers_copied(self):
+        headers = {}
+        self.compressor.compress_response(self.body, headers, 'gzip')
+        self.assertEqual(headers, {})
+
+    def test_gzip_stream(self):
+        chunks = [self.body[i:i + 50].encode('utf-8')
+                  for i in range(0, len(self.body), 50)]
+        body, headers = self.compressor.compress_response(
+            iter(chunks), {}, 'gzip')
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(b''.join(body)).decode('utf-8'),
+                         self.body)
+
+    @unittest.skipIf(brotli is None, 'brotli is not installed')
+    def test_brotli(self):
+        body, headers = self.compressor.compress_response(self.body, {}, 'br')
+        self.assertEqual(headers['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(body).decode('utf-8'), self.body)
+        chunks = iter([self.body[:70].encode('utf-8'), self.body[70:].encode('utf-8')])
+        body, headers = self.compressor.compress_response(chunks, {}, 'br')
+        self.assertEqual(brotli.decompress(b''.join(body)).decode('utf-8'),
+                         self.body)
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from thorium import Resource, errors, fields
+from thorium.decoder import ResourceDecoder
+from thorium.serializer import OrjsonBackend, orjson
+
+
+class DecodedResource(Resource):
+    id = fields.IntField(default=None)
+    name = fields.CharField(notnull=True)
+    active = fields.BoolField(default=True)
+
+
+class TestResourceDecoder(unittest.TestCase):
+
+    def setUp(self):
+        self.decoder = ResourceDecoder(DecodedResource)
+
+    def test_decode_object(self):
+        resource, resources = self.decoder.decode(b'{"id": "5", "name": "Jim"}')
+        self.assertEqual(resources, [])
+        self.assertIsInstance(resource, DecodedResource)
+        self.assertEqual(resource.id, 5)
+        self.assertEqual(resource.name, 'Jim')
+        self.assertEqual(resource.active, True)
+
+    def test_decode_array(self):
+        resource, resources = self.decoder.decode(
+            b'[{"id": 1, "name": "Jim"}, {"id": 2, "name": "Bob", "active": false}]')
+        self.assertIsNone(resource)
+        self.assertEqual([r.id for r in resources], [1, 2])
+        self.assertEqual([r.active for r in resources], [True, False])
+
+    def test_decode_str(self):
+        resource, _ = self.decoder.decode('{"name": "Jim"}')
+        self.assertEqual(resource.name, 'Jim')
+
+    def test_decode_partial(self):
+        resource, _ = self.decoder.decode(b'{"name": "Jim"}', partial=True)
+        self.assertTrue(resource.is_partial)
+        self.assertEqual(resource.name, 'Jim')
+        self.assertFalse(resource.is_set('active'))
+
+    def test_identifiers_override_body(self):
+        resource, _ = self.decoder.decode(b'{"id": 1, "name": "Jim"}',
+                                          identifiers={'id': 7, 'event_id': 3})
+        self.assertEqual(resource.id, 7)
+
+    def test_empty_body(self):
+        resource, _ = self.decoder.decode(b'', partial=True)
+        self.assertIsInstance(resource, DecodedResource)
+
+    def test_unknown_key(self):
+        with self.assertRaises(errors.ValidationError):
+            self.decoder.decode(b'{"name": "Jim", "age": 5}')
+
+    def test_standard_library_by_default(self):
+        resource, _ = self.decoder.decode(
+            b'{"id": 1180591620717411303424, "name": "Jim"}')
+        self.assertEqual(resource.id, 2 ** 70)
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_orjson_backend(self):
+        decoder = ResourceDecoder(DecodedResource, backend=OrjsonBackend())
+        resource, _ = decoder.decode(b'{"id": 5, "name": "Jim"}')
+        self.assertEqual(resource.id, 5)
+        with self.assertRaises(errors.ValidationError):
+            decoder.decode(b'{"id": NaN, "name": "Jim"}')
+
+    def test_invalid_json(self):
+        with self.assertRaises(errors.ValidationError):
+            self.decoder.decode(b'{"name": ')
+
+    def test_invalid_item(self):
+        with self.assertRaises(errors.ValidationError):
+            self.decoder.decode(b'[{"name": "Jim"}, 5]')
+
+    def test_invalid_value(self):
+        with self.assertRaises(errors.ValidationError):
+            self.decoder.decode(b'{"name": null}')
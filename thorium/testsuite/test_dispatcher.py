@@ -0,0 +1,168 @@
+import json
+
+from unittest import TestCase, mock
+from thorium import Endpoint, Resource, Request, errors, fields
+from thorium.dispatcher import CollectionDispatcher, DetailDispatcher
+from thorium.response import DetailResponse
+from thorium.serializer import JsonBackend
+
+
+class SimpleResource(Resource):
+    id = fields.IntField()
+
+
+class HookedEndpoint(Endpoint):
+    Resource = SimpleResource
+    _authenticator_classes = None
+
+    def pre_request_detail(self):
+        self.response.calls.append('pre_request_detail')
+
+    def post_request(self):
+        self.response.calls.append('post_request')
+
+    def get_detail(self):
+        self.response.resource = SimpleResource(id=1)
+        self.response.calls.append('get_detail')
+
+
+class TestDispatcher(TestCase):
+
+    def setUp(self):
+        self.dispatcher = DetailDispatcher(endpoint_cls=HookedEndpoint,
+                                           resource_cls=SimpleResource,
+                                           parameters_cls=None,
+                                           allowed_methods={'get', 'put'})
+        self.request = mock.MagicMock(spec=Request)
+        self.request.method = 'GET'
+
+    def test_compiled_dispatch(self):
+        self.assertEqual(self.dispatcher._dispatch_table,
+                         {'GET': HookedEndpoint.get_detail,
+                          'PUT': Endpoint.put_detail})
+        self.assertEqual(self.dispatcher.allow_header, 'GET, PUT')
+        self.assertEqual(len(self.dispatcher._pre_request_hooks), 1)
+        self.assertIs(self.dispatcher.get_serializer(),
+                      self.dispatcher.get_serializer())
+
+    def test_no_hooks(self):
+        dispatcher = CollectionDispatcher(endpoint_cls=HookedEndpoint,
+                                          resource_cls=SimpleResource,
+                                          parameters_cls=None,
+                                          allowed_methods={'get'})
+        self.assertEqual(dispatcher._pre_request_hooks, ())
+
+    def test_dispatcher_pre_request_kept(self):
+        class LoggingDispatcher(CollectionDispatcher):
+            def pre_request(self, engine):
+                pass
+
+        dispatcher = LoggingDispatcher(endpoint_cls=HookedEndpoint,
+                                       resource_cls=SimpleResource,
+                                       parameters_cls=None,
+                                       allowed_methods={'get'})
+        self.assertEqual(len(dispatcher._pre_request_hooks), 1)
+
+    def test_overridden_authenticate(self):
+        class DeniedEndpoint(HookedEndpoint):
+            def authenticate(self, method):
+                raise errors.UnauthorizedError()
+
+        dispatcher = DetailDispatcher(endpoint_cls=DeniedEndpoint,
+                                      resource_cls=SimpleResource,
+                                      parameters_cls=None,
+                                      allowed_methods={'get'})
+        with self.assertRaises(errors.UnauthorizedError):
+            dispatcher.dispatch(self.request)
+
+    def test_json_backend(self):
+        backend = JsonBackend()
+
+        class BackendEndpoint(HookedEndpoint):
+            json_backend = backend
+
+        dispatcher = DetailDispatcher(endpoint_cls=BackendEndpoint,
+                                      resource_cls=SimpleResource,
+                                      parameters_cls=None,
+                                      allowed_methods={'get'})
+        self.assertIs(dispatcher.get_serializer().backend, backend)
+
+    def test_dispatch(self):
+        def build_response_obj(request):
+            response = DetailResponse(request)
+            response.calls = []
+            return response
+        self.dispatcher.build_response_obj = build_response_obj
+        response, body = self.dispatcher.dispatch(self.request)
+        self.assertEqual(response.calls,
+                         ['pre_request_detail', 'get_detail', 'post_request'])
+        self.assertEqual(json.loads(body)['data'], {'id': 1})
+
+
+class VersionedEndpoint(HookedEndpoint):
+
+    def etag_detail(self):
+        self.response.calls.append('etag_detail')
+        return 'v7'
+
+
+class HashedEndpoint(HookedEndpoint):
+    etag_response = True
+
+
+class TestConditionalGet(TestCase):
+
+    def dispatch(self, endpoint_cls, headers=None, method='GET'):
+        dispatcher = DetailDispatcher(endpoint_cls=endpoint_cls,
+                                      resource_cls=SimpleResource,
+                                      parameters_cls=None,
+                                      allowed_methods={'get', 'put'})
+
+        def build_response_obj(request):
+            response = DetailResponse(request)
+            response.calls = []
+            return response
+        dispatcher.build_response_obj = build_response_obj
+        request = Request(dispatcher, method, {}, None, None, None, [], '/',
+                          headers=headers)
+        return dispatcher.dispatch(request)
+
+    def test_version_token(self):
+        response, body = self.dispatch(VersionedEndpoint)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['ETag'], '"v7"')
+        self.assertEqual(json.loads(body)['data'], {'id': 1})
+
+    def test_version_token_not_modified(self):
+        response, body = self.dispatch(VersionedEndpoint,
+                                       {'if-none-match': '"v6", W/"v7"'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(body, '')
+        self.assertEqual(response.headers['ETag'], '"v7"')
+        self.assertEqual(response.calls,
+                         ['pre_request_detail', 'etag_detail', 'post_request'])
+
+    def test_version_token_modified(self):
+        response, body = self.dispatch(VersionedEndpoint,
+                                       {'if-none-match': '"v6"'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('get_detail', response.calls)
+
+    def test_version_token_only_for_get(self):
+        # the put reaches the endpoint method rather than being answered 304
+        with self.assertRaises(errors.MethodNotImplementedError):
+            self.dispatch(VersionedEndpoint, {'if-none-match': '*'}, method='PUT')
+
+    def test_hashed_body(self):
+        response, body = self.dispatch(HashedEndpoint)
+        etag = response.headers['ETag']
+        self.assertEqual(json.loads(body)['data'], {'id': 1})
+        response, body = self.dispatch(HashedEndpoint, {'if-none-match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(body, '')
+        self.assertEqual(response.headers['ETag'], etag)
+
+    def test_no_etag_by_default(self):
+        response, body = self.dispatch(HookedEndpoint, {'if-none-match': '*'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response.headers)
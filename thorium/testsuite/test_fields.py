@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 
+import copy
 import datetime
+import pickle
 import types
 import uuid
 import re
@@ -37,6 +39,22 @@ class TestNotSet(TestCase):
             hit = True
         self.assertTrue(hit)
 
+    def test_notset_is_not_string(self):
+        self.assertNotEqual(NotSet, 'NotSet')
+        self.assertNotEqual('NotSet', NotSet)
+
+    def test_notset_does_not_stringify(self):
+        other = mock.MagicMock()
+        other.__str__.side_effect = AssertionError('str() called')
+        self.assertNotEqual(NotSet, other)
+        self.assertFalse(NotSet == other)
+
+    def test_notset_is_singleton(self):
+        self.assertIs(copy.copy(NotSet), NotSet)
+        self.assertIs(copy.deepcopy(NotSet), NotSet)
+        self.assertIs(pickle.loads(pickle.dumps(NotSet)), NotSet)
+        self.assertEqual(hash(NotSet), hash(NotSet))
+
 
 class TestExtraFlags(TestCase):
 
@@ -108,6 +126,20 @@ class TestCharValidator(TestCase):
     def test_int_invalid(self):
         self.assertRaises(errors.ValidationError, self.validator.validate, 1)
 
+    def test_compile(self):
+        validate = self.validator.compile()
+        self.assertEqual(validate('test1'), 'test1')
+        self.assertEqual(validate(NotSet), NotSet)
+        self.assertRaises(errors.ValidationError, validate, None)
+        self.assertRaises(errors.ValidationError, validate, 1)
+        self.assertRaises(errors.ValidationError, validate, 'test12345678')
+        self.assertRaises(errors.ValidationError, validate, 'nomatch')
+
+    def test_compile_cast(self):
+        self.char_field.flags['regex'] = None
+        validate = self.validator.compile(cast=True)
+        self.assertEqual(validate(1), '1')
+
     def test_bool_invalid(self):
         self.assertRaises(errors.ValidationError, self.validator.validate,
                           True)
@@ -176,6 +208,16 @@ class TestDateValidator(TestCase):
     def test_int_invalid(self):
         self.assertRaises(errors.ValidationError, self.validator.validate, 1)
 
+    def test_str_to_date(self):
+        self.assertEqual(self.validator.validate('2015-03-02', cast=True),
+                         datetime.date(2015, 3, 2))
+        self.assertEqual(self.validator.validate('2015-3-2', cast=True),
+                         datetime.date(2015, 3, 2))
+
+    def test_str_non_canonical_invalid(self):
+        self.assertRaises(errors.ValidationError, self.validator.validate,
+                          '20150302', cast=True)
+
 
 class TestDateTimeValidator(TestCase):
 
@@ -221,6 +263,83 @@ class TestDateTimeValidator(TestCase):
         self.assertRaises(errors.ValidationError, self.validator.validate,
                           'asdf')
 
+    def test_isoformated_datetime_with_offset(self):
+        result = self.validator.validate('2015-03-02T14:41:53+02:00', cast=True)
+        self.assertEqual(result, datetime.datetime(2015, 3, 2, 14, 41, 53))
+        self.assertIsNone(result.tzinfo)
+
+    def test_long_fraction_falls_back_to_arrow(self):
+        result = self.validator.validate('2015-03-02T14:41:53.8349106Z', cast=True)
+        self.assertEqual(result, datetime.datetime(2015, 3, 2, 14, 41, 53, 834911))
+
+    def test_unparsable_str_raises_validation_error(self):
+        with self.assertRaises(errors.ValidationError):
+            self.validator.validate('2015-13-45', cast=True)
+
+    def test_other_forms_parsed_by_arrow(self):
+        # datetime.fromisoformat accepts these on some python versions only
+        for value, expected in (
+                ('20200101T000000', datetime.datetime(2020, 1, 1)),
+                ('2020-01-01 00:00Z', datetime.datetime(2020, 1, 1)),
+                ('2020-01-01T10:30:00.1', datetime.datetime(2020, 1, 1, 10, 30, 0, 100000))):
+            with mock.patch.object(validators.arrow, 'get',
+                                   wraps=validators.arrow.get) as get:
+                self.assertEqual(self.validator.validate(value, cast=True),
+                                 expected)
+            self.assertTrue(get.called, value)
+
+    def test_canonical_forms_parsed_without_arrow(self):
+        for value in ('2020-01-01', '2020-01-01T10:30', '2020-01-01 10:30:00',
+                      '2020-01-01T10:30:00.123', '2020-01-01T10:30:00.123456+05:30'):
+            with mock.patch.object(validators.arrow, 'get') as get:
+                self.validator.validate(value, cast=True)
+            self.assertFalse(get.called, value)
+
+
+class TestCastCache(TestCase):
+
+    def setUp(self):
+        field = mock.MagicMock(fields.DateTimeField)
+        field.flags = {'options': None, 'notnull': False}
+        self.validator = validators.DateTimeValidator(field)
+
+    def tearDown(self):
+        validators.DateTimeValidator.set_cast_cache(0)
+        validators.UUIDValidator.set_cast_cache(0)
+
+    def test_disabled_by_default(self):
+        self.assertEqual(validators.DateTimeValidator.cast_cache_size, 0)
+        self.assertFalse(hasattr(validators.DateTimeValidator._convert_str,
+                                 'cache_info'))
+
+    def test_cache_hits(self):
+        validators.DateTimeValidator.set_cast_cache(2)
+        compiled = self.validator.compile(cast=True)
+        for _ in range(3):
+            self.assertEqual(compiled('2015-03-02T14:41:53'),
+                             datetime.datetime(2015, 3, 2, 14, 41, 53))
+        info = validators.DateTimeValidator._convert_str.cache_info()
+        self.assertEqual((info.hits, info.misses, info.maxsize), (2, 1, 2))
+
+    def test_cache_is_bounded(self):
+        validators.UUIDValidator.set_cast_cache(2)
+        field = mock.MagicMock(fields.UUIDField)
+        field.flags = {'options': None, 'notnull': False}
+        validator = validators.UUIDValidator(field)
+        for _ in range(3):
+            validator.validate(str(uuid.uuid4()), cast=True)
+        self.assertEqual(validators.UUIDValidator._convert_str.cache_info().currsize, 2)
+
+    def test_errors_are_not_cached(self):
+        validators.DateTimeValidator.set_cast_cache(8)
+        for _ in range(2):
+            self.assertRaises(errors.ValidationError, self.validator.validate,
+                              'asdf', cast=True)
+        self.assertEqual(validators.DateTimeValidator._convert_str.cache_info().currsize, 0)
+
+    def test_unsupported_validator(self):
+        self.assertRaises(TypeError, validators.CharValidator.set_cast_cache, 8)
+
 
 class TestTimeValidator(TestCase):
 
@@ -57,3 +57,47 @@ class TestSimpleParams(TestCase):
         }
 
         self.assertRaises(errors.ValidationError, SimpleParams.validate, data)
+
+
+class ListParams(Parameters):
+    ids = params.ListParam(item_type=params.IntParam())
+    name = params.CharParam(default=None)
+
+
+class TestParametersQueryString(TestCase):
+
+    def setUp(self):
+        ListParams._query_cache.cache_clear()
+
+    def test_validate_query_string(self):
+        result = ListParams.validate_query_string(b'ids=1,2,3&name=abc')
+        self.assertEqual(dict(result), {'ids': [1, 2, 3], 'name': 'abc'})
+
+    def test_validate_query_string_first_value(self):
+        result = ListParams.validate_query_string('name=abc&name=def')
+        self.assertEqual(result['name'], 'abc')
+
+    def test_validate_query_string_mutable(self):
+        result = ListParams.validate_query_string('name=abc')
+        result['name'] = 'def'
+        self.assertEqual(ListParams.validate_query_string('name=abc'),
+                         {'name': 'abc'})
+
+    def test_validate_query_string_cached(self):
+        first = ListParams.validate_query_string(b'ids=1,2')
+        first['ids'].append(99)
+        second = ListParams.validate_query_string(b'ids=1,2')
+        self.assertEqual(second['ids'], [1, 2])
+        self.assertIsNot(first, second)
+        self.assertEqual(ListParams._query_cache.cache_info().hits, 1)
+
+    def test_validate_query_string_invalid(self):
+        for _ in range(2):
+            self.assertRaises(errors.ValidationError,
+                              ListParams.validate_query_string, 'bad=1')
+        self.assertEqual(ListParams._query_cache.cache_info().currsize, 0)
+
+    def test_validate_query_string_per_class(self):
+        ListParams.validate_query_string('name=abc')
+        self.assertRaises(errors.ValidationError,
+                          SimpleParams.validate_query_string, 'ids=1')
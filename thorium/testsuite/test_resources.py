@@ -164,6 +164,29 @@ class TestSimpleResource(TestCase):
         s2 = SimpleResource(name='b')
         self.assertEqual(s1.name, 'a')
 
+    def test_compiled_plan(self):
+        self.assertEqual(set(SimpleResource._plan[False]),
+                         {'name', 'age', 'readonly'})
+        self.assertEqual(set(SimpleResource._plan[True]),
+                         {'name', 'age', 'readonly'})
+        self.assertEqual({key for key, _ in SimpleResource._full_required},
+                         {'name', 'age'})
+        self.assertEqual(SimpleResource._partial_required, ())
+
+    def test_from_dict_cast(self):
+        self.resource.from_dict({'age': '42'}, cast=True)
+        self.assertEqual(self.resource.age, 42)
+        self.assertRaises(errors.ValidationError, self.resource.from_dict,
+                          {'age': '42'})
+
+    def test_set_notset_on_full_resource(self):
+        self.assertRaises(errors.ValidationError, setattr, self.resource,
+                          'name', NotSet)
+        self.assertRaises(errors.ValidationError, self.resource.from_dict,
+                          {'age': NotSet})
+        self.resource.readonly = NotSet
+        self.assertEqual(self.resource.readonly, NotSet)
+
 
 class ComplexResource(resources.Resource):
     name = fields.CharField(max_length=20)
@@ -403,3 +426,256 @@ class TestComplexResource(TestCase):
         self.assertEqual(self.full.name, co.name)
         self.assertEqual(self.full.admin, co.administrator)
         self.assertEqual(self.full.birth_date, co.birth)
+
+
+class CompactResource(resources.Resource):
+    _compact = True
+    name = fields.CharField(default=None)
+    age = fields.IntField(default=None)
+    readonly = fields.IntField(readonly=True)
+
+
+class CompactChildResource(CompactResource):
+    admin = fields.BoolField(default=False)
+
+
+class TestCompactResource(TestCase):
+
+    def test_no_instance_dict(self):
+        res = CompactResource(name='Ford', age=200)
+        self.assertFalse(hasattr(res, '__dict__'))
+        self.assertIsInstance(res._values, list)
+        self.assertRaises(AttributeError, setattr, res, 'extra', 1)
+
+    def test_get_and_set(self):
+        res = CompactResource(name='Ford', age=200)
+        self.assertEqual(res.name, 'Ford')
+        self.assertEqual(res.age, 200)
+        self.assertEqual(res.readonly, NotSet)
+        res.age = 201
+        self.assertEqual(res.age, 201)
+        self.assertRaises(errors.ValidationError, setattr, res, 'age', 'old')
+
+    def test_items(self):
+        res = CompactResource(name='Ford', age=200)
+        self.assertEqual(dict(res.items()),
+                         {'name': 'Ford', 'age': 200, 'readonly': NotSet})
+        self.assertEqual(res.to_dict(), {'name': 'Ford', 'age': 200})
+
+    def test_partial(self):
+        res = CompactResource.partial(name='Zaphod')
+        self.assertEqual(res.name, 'Zaphod')
+        self.assertEqual(res.age, NotSet)
+        self.assertEqual(res.to_dict(), {'name': 'Zaphod'})
+
+    def test_from_obj(self):
+        so = SimpleObj()
+        so.name = 'Slartibartfast'
+        so.age = 5000050
+        res = CompactResource.init_from_obj(so)
+        self.assertEqual(res.name, so.name)
+        self.assertEqual(res.age, so.age)
+
+    def test_inheritance(self):
+        self.assertTrue(CompactChildResource._compact)
+        res = CompactChildResource(name='Trillian', admin=True)
+        self.assertFalse(hasattr(res, '__dict__'))
+        self.assertEqual(res.name, 'Trillian')
+        self.assertEqual(res.admin, True)
+        self.assertEqual(res.age, None)
+
+
+class TestBulkResource(TestCase):
+
+    def setUp(self):
+        self.rows = [
+            {'name': 'Arthur', 'age': 30, 'admin': False,
+             'birth_date': datetime.datetime(1978, 3, 8)},
+            {'name': 'Ford', 'age': 200, 'admin': True,
+             'birth_date': '1978-03-08T10:00:00'},
+        ]
+
+    def assertSameResources(self, resources, expected):
+        self.assertEqual([type(r) for r in resources],
+                         [type(r) for r in expected])
+        self.assertEqual([dict(r.items()) for r in resources],
+                         [dict(r.items()) for r in expected])
+        self.assertEqual([r.is_partial for r in resources],
+                         [r.is_partial for r in expected])
+
+    def test_init_many_from_dicts(self):
+        resources = ComplexResource.init_many_from_dicts(self.rows, cast=True)
+        expected = [ComplexResource.init_from_dict(row, cast=True)
+                    for row in self.rows]
+        self.assertSameResources(resources, expected)
+
+    def test_init_many_from_dicts_partial(self):
+        rows = [{'name': 'Zaphod'}, {'age': 2}]
+        resources = ComplexResource.init_many_from_dicts(rows, partial=True)
+        expected = [ComplexResource.init_from_dict(row, partial=True)
+                    for row in rows]
+        self.assertSameResources(resources, expected)
+
+    def test_init_many_from_dicts_compact(self):
+        rows = [{'name': 'Trillian'}, {'name': 'Zaphod', 'admin': True}]
+        resources = CompactChildResource.init_many_from_dicts(rows)
+        expected = [CompactChildResource.init_from_dict(row) for row in rows]
+        self.assertSameResources(resources, expected)
+        self.assertFalse(hasattr(resources[0], '__dict__'))
+
+    def test_init_many_from_dicts_default_function(self):
+        class DefaultResource(resources.Resource):
+            created = fields.DateTimeField(default=datetime.datetime.now)
+
+        first, second = DefaultResource.init_many_from_dicts([{}, {}])
+        self.assertIsInstance(first.created, datetime.datetime)
+        self.assertLessEqual(first.created, second.created)
+
+    def test_init_many_from_dicts_invalid(self):
+        self.rows[1]['age'] = 'old'
+        self.assertRaises(errors.ValidationError,
+                          ComplexResource.init_many_from_dicts, self.rows)
+        del self.rows[1]['age']
+        self.assertRaises(errors.ValidationError,
+                          ComplexResource.init_many_from_dicts, self.rows)
+        self.rows[1]['age'] = NotSet
+        self.assertRaises(errors.ValidationError,
+                          ComplexResource.init_many_from_dicts, self.rows)
+
+    def test_init_many_lazy(self):
+        resources = ComplexResource.init_many_from_dicts(iter(self.rows),
+                                                         cast=True, lazy=True)
+        self.assertIsInstance(resources, types.GeneratorType)
+        self.assertEqual([r.name for r in resources], ['Arthur', 'Ford'])
+
+    def test_init_many_from_objs(self):
+        objs = []
+        for name in ('Timmy!', 'Jimmy!'):
+            co = ComplexObj()
+            co.name = name
+            co.administrator = False
+            co.birth = datetime.datetime.now()
+            objs.append(co)
+        kwargs = {'mapping': ComplexObj.resource_mapping,
+                  'override': {'age': 29}}
+        resources = ComplexResource.init_many_from_objs(objs, **kwargs)
+        expected = [ComplexResource.init_from_obj(co, **kwargs) for co in objs]
+        self.assertSameResources(resources, expected)
+
+    def test_init_many_from_objs_partial(self):
+        so = SimpleObj()
+        so.name = 'Slartibartfast'
+        del so.age
+        resources = CompactResource.init_many_from_objs(
+            [so], partial=True, mapping={'readonly': None})
+        expected = [CompactResource.init_from_obj(
+            so, partial=True, mapping={'readonly': None})]
+        self.assertSameResources(resources, expected)
+
+
+class DetailResource(resources.Resource):
+    id = fields.IntField()
+    name = fields.CharField(default=None)
+    bio = fields.CharField(default=None, detail=True)
+
+
+class DetailChildResource(DetailResource):
+    age = fields.IntField(default=None)
+
+
+class TestFieldOrder(TestCase):
+
+    def test_sorted_fields(self):
+        self.assertEqual(DetailResource._sorted_fields,
+                         (('id', 'id'), ('name', 'name'), ('bio', 'bio')))
+        self.assertEqual(DetailResource._collection_fields,
+                         (('id', 'id'), ('name', 'name')))
+
+    def test_inherited_fields(self):
+        self.assertEqual([name for name, _ in DetailChildResource._sorted_fields],
+                         ['id', 'name', 'bio', 'age'])
+        self.assertEqual([name for name, _ in DetailChildResource._collection_fields],
+                         ['id', 'name', 'age'])
+
+    def test_compact_keys(self):
+        self.assertEqual(CompactChildResource._sorted_fields,
+                         (('name', 0), ('age', 1), ('readonly', 2), ('admin', 3)))
+
+    def test_sorted_items(self):
+        res = DetailResource(id=1, name='Ford', bio='b')
+        self.assertEqual(list(res.sorted_items()),
+                         [('id', 1), ('name', 'Ford'), ('bio', 'b')])
+        res = CompactChildResource(name='Ford', age=200)
+        self.assertEqual(list(res.sorted_items()),
+                         [('name', 'Ford'), ('age', 200), ('readonly', NotSet),
+                          ('admin', False)])
+
+
+class TestResourceCollection(TestCase):
+
+    def setUp(self):
+        self.rows = [{'id': i, 'name': 'n{0}'.format(i), 'bio': 'b'}
+                     for i in range(5)]
+        self.collection = resources.ResourceCollection.from_dicts(
+            DetailResource, self.rows)
+
+    def test_iter_response_data_fields(self):
+        data = list(self.collection.iter_response_data(('name', 'bio')))
+        self.assertEqual(data[0], {'name': 'n0'})
+        self.assertEqual(list(self.collection.iter_response_data(('bio',))),
+                         [{}] * 5)
+
+    def test_from_dicts(self):
+        self.assertEqual(len(self.collection), 5)
+        self.assertEqual(self.collection.column('id'), [0, 1, 2, 3, 4])
+        self.assertEqual([r.to_dict() for r in self.collection], self.rows)
+
+    def test_from_columns(self):
+        collection = resources.ResourceCollection.from_columns(
+            DetailResource, {'id': ['1', '2']}, cast=True)
+        self.assertEqual(collection.column('id'), [1, 2])
+        self.assertEqual(collection.column('name'), [None, None])
+
+    def test_from_columns_invalid(self):
+        ResourceCollection = resources.ResourceCollection
+        self.assertRaises(errors.ValidationError, ResourceCollection.from_columns,
+                          DetailResource, {'id': ['a']})
+        self.assertRaises(errors.ValidationError, ResourceCollection.from_columns,
+                          DetailResource, {'name': ['a']})
+        self.assertRaises(errors.ValidationError, ResourceCollection.from_columns,
+                          DetailResource, {'id': [1], 'name': []})
+        self.assertRaises(errors.ValidationError, ResourceCollection.from_columns,
+                          DetailResource, {'id': [1], 'other': [1]})
+
+    def test_getitem(self):
+        resource = self.collection[-1]
+        self.assertIsInstance(resource, DetailResource)
+        self.assertEqual(resource.id, 4)
+        self.assertFalse(resource.is_partial)
+        self.assertRaises(IndexError, self.collection.__getitem__, 5)
+        page = self.collection[1:3]
+        self.assertIsInstance(page, resources.ResourceCollection)
+        self.assertEqual(page.column('id'), [1, 2])
+
+    def test_append(self):
+        self.collection.append(DetailResource(id=9))
+        self.assertEqual(len(self.collection), 6)
+        self.assertEqual(self.collection[5].name, None)
+        self.assertRaises(errors.ValidationError, self.collection.append,
+                          DetailResource.partial(id=10))
+        self.assertRaises(errors.ValidationError, self.collection.append,
+                          SimpleResource())
+
+    def test_compact(self):
+        collection = resources.ResourceCollection.from_dicts(
+            CompactResource, [{'name': 'Ford', 'age': 200}])
+        self.assertEqual(collection[0].name, 'Ford')
+        self.assertEqual(collection[0].readonly, NotSet)
+
+    def test_take(self):
+        taken = self.collection.take([4, 0])
+        self.assertEqual(taken.column('name'), ['n4', 'n0'])
+
+    def test_iter_response_data(self):
+        data = list(self.collection.iter_response_data())
+        self.assertEqual(list(data[0].items()), [('id', 0), ('name', 'n0')])
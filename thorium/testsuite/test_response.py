@@ -1,11 +1,19 @@
 # -*- coding: utf-8 -*-
 
+import base64
+import datetime
+import random
+import unittest
+
+from operator import attrgetter
 from unittest import TestCase, mock
 
+from thorium import response as response_module
 from thorium.response import (Response, DetailResponse, CollectionResponse,
                               ErrorResponse)
 from thorium.errors import MethodNotAllowedError, BadRequestError
-from thorium import Resource, fields
+from thorium import Resource, ResourceCollection, errors, fields
+from thorium.request import Request
 
 
 class SimpleResource(Resource):
@@ -25,6 +33,7 @@ class TestResponse(TestCase):
 
     def setUp(self):
         self.request_mock = mock.MagicMock()
+        self.request_mock.fields = None
         self.response = Response(request=self.request_mock)
 
     def test_location_header(self):
@@ -41,6 +50,7 @@ class TestDetailResponse(TestCase):
 
     def setUp(self):
         self.request_mock = mock.MagicMock()
+        self.request_mock.fields = None
         self.response = DetailResponse(request=self.request_mock)
 
     def test_attributes(self):
@@ -59,11 +69,40 @@ class TestDetailResponse(TestCase):
         data = self.response.get_response_data()
         self.assertEqual(data, {'id': 1, 'name': 'a'})
 
+    def test_get_response_data_fields(self):
+        self.request_mock.fields = ('name',)
+        response = DetailResponse(request=self.request_mock)
+        response.resource = SimpleResource(id=1, name='a')
+        self.assertEqual(response.get_response_data(), {'name': 'a'})
+
+
+class TestRequestFields(TestCase):
+
+    def build_request(self, params):
+        dispatcher = mock.MagicMock()
+        dispatcher.Resource = SimpleResource
+        return Request(dispatcher, 'GET', {}, params, None, None, [], '/')
+
+    def test_no_fields(self):
+        self.assertIsNone(self.build_request(None).fields)
+        self.assertIsNone(self.build_request({'fields': ''}).fields)
+
+    def test_declaration_order(self):
+        request = self.build_request({'fields': 'name, id'})
+        self.assertEqual(request.fields, ('id', 'name'))
+        request = self.build_request({'fields': ['name']})
+        self.assertEqual(request.fields, ('name',))
+
+    def test_unknown_field(self):
+        with self.assertRaises(errors.ValidationError):
+            self.build_request({'fields': 'name,age'})
+
 
 class TestCollectionResponse(TestCase):
 
     def setUp(self):
         self.request_mock = mock.MagicMock()
+        self.request_mock.fields = None
         self.request_mock.params.sort = None
         self.request_mock.params.offset = None
         self.request_mock.params.limit = None
@@ -176,6 +215,86 @@ class TestCollectionResponse(TestCase):
         self.assertEqual(data[1], {'id': 1, 'name': 'a'})
         self.assertEqual(data[2], {'id': 3, 'name': 'b'})
 
+    def test_get_response_data_sort_matches_multiple_passes(self):
+        rng = random.Random(7)
+        resources = [
+            SimpleResource(id=rng.choice([None, 1, 2, 3]),
+                           name=rng.choice([None, 'a', 'b']))
+            for x in range(60)
+        ]
+        for sort in ('id', '-id', 'name,id', '-name,-id', '-name,id',
+                     'name,-id', 'id,-name,+id'):
+            expected = list(resources)
+            for field in reversed(sort.split(',')):
+                reverse = field.startswith('-')
+                field = field.lstrip('+-')
+                nones = [r for r in expected if getattr(r, field) is None]
+                values = [r for r in expected if getattr(r, field) is not None]
+                values.sort(key=attrgetter(field), reverse=reverse)
+                expected = values + nones if reverse else nones + values
+            self.response.resources = list(resources)
+            self.response.sort = sort
+            self.response._sort()
+            self.assertEqual(
+                [id(r) for r in self.response.resources],
+                [id(r) for r in expected],
+                sort
+            )
+
+    def test_get_response_data_sort_top_k(self):
+        rng = random.Random(11)
+        resources = [
+            SimpleResource(id=rng.choice([None, 1, 2, 3, 4, 5]),
+                           name=rng.choice([None, 'a', 'b', 'c']))
+            for x in range(400)
+        ]
+        for sort in ('id', '-id', 'name,id', '-name,-id', '-name,id',
+                     'name,-id'):
+            self.response.resources = list(resources)
+            self.response.sort = sort
+            self.response.meta['pagination']['offset'] = None
+            self.response.meta['pagination']['limit'] = None
+            expected = self.response.get_response_data()[3:8]
+
+            self.response.resources = list(resources)
+            self.response.meta['pagination']['offset'] = 3
+            self.response.meta['pagination']['limit'] = 5
+            self.response.meta['pagination']['paginated'] = False
+            with mock.patch('thorium.response._select_resources',
+                            wraps=response_module._select_resources) as select:
+                data = self.response.get_response_data()
+                self.assertTrue(select.called)
+            self.assertEqual(data, expected, sort)
+            self.assertEqual(self.response.meta['pagination']['next_page'], 8)
+
+    def test_get_response_data_collection(self):
+        rng = random.Random(13)
+        rows = [{'id': rng.choice([None, 1, 2, 3, 4, 5]),
+                 'name': rng.choice([None, 'a', 'b', 'c'])}
+                for x in range(400)]
+        for sort, offset, limit in (('-name,id', 3, 5), ('id,-name', 0, 200),
+                                    (None, 390, 20)):
+            results = []
+            for resources in (
+                    [SimpleResource(row) for row in rows],
+                    ResourceCollection.from_dicts(SimpleResource, rows)):
+                response = CollectionResponse(request=self.request_mock)
+                response.resources = resources
+                response.sort = sort
+                response.meta['pagination']['offset'] = offset
+                response.meta['pagination']['limit'] = limit
+                results.append((response.get_response_data(),
+                                response.meta['pagination']))
+            self.assertEqual(results[0], results[1], sort)
+
+    def test_collection_sort_not_a_field(self):
+        for sort in ('is_partial', 'validate', '-_values'):
+            response = CollectionResponse(request=self.request_mock)
+            response.resources = ResourceCollection.from_dicts(
+                SimpleResource, [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}])
+            response.sort = sort
+            self.assertRaises(BadRequestError, response.get_response_data)
+
     def test_get_response_data_sort_invalid(self):
         self.response.resources = self.test_data
         self.response.sort = '+NotAField'
@@ -252,10 +371,298 @@ class TestCollectionResponse(TestCase):
         self.assertRaises(BadRequestError, self.response.get_response_data)
 
 
+class NumericResource(Resource):
+    id = fields.IntField()
+    score = fields.DecimalField()
+    created = fields.DateTimeField()
+    day = fields.DateField()
+    name = fields.CharField()
+
+
+@unittest.skipIf(response_module.numpy is None, 'numpy is not installed')
+class TestNumpySort(TestCase):
+
+    def setUp(self):
+        rng = random.Random(17)
+        base = datetime.datetime(2000, 1, 1)
+        self.resources = [
+            NumericResource(
+                id=rng.choice([None, -3, 0, 1, 2, 2 ** 40]),
+                score=rng.choice([None, -1.5, 0.0, 1, 2.25]),
+                created=rng.choice([None, base, base + datetime.timedelta(seconds=1),
+                                    base - datetime.timedelta(days=400)]),
+                day=rng.choice([None, base.date(), datetime.date(1960, 5, 1)]),
+                name=rng.choice([None, 'a', 'b']),
+            )
+            for x in range(1500)
+        ]
+
+    def assertSortMatches(self, sort_fields, limit=None, vectorized=True):
+        orders = []
+        _numpy_order = response_module._numpy_order
+
+        def numpy_order(*args):
+            orders.append(_numpy_order(*args))
+            return orders[-1]
+
+        with mock.patch('thorium.response._numpy_order', numpy_order):
+            result = response_module.sort_resources(self.resources,
+                                                    sort_fields, limit)
+        self.assertEqual(orders[0] is not None, vectorized)
+        with mock.patch('thorium.response.numpy', None):
+            expected = response_module.sort_resources(self.resources,
+                                                      sort_fields, limit)
+        if isinstance(result, ResourceCollection):
+            self.assertTrue(list(result.iter_response_data()) ==
+                            list(expected.iter_response_data()), sort_fields)
+        else:
+            self.assertTrue([id(r) for r in result] == [id(r) for r in expected],
+                            sort_fields)
+
+    def test_numeric_fields(self):
+        for sort_fields in ([('id', False)], [('id', True)],
+                            [('score', True), ('id', False)],
+                            [('created', False), ('score', True)],
+                            [('day', True), ('created', True), ('id', False)]):
+            self.assertSortMatches(sort_fields)
+            self.assertSortMatches(sort_fields, limit=600)
+
+    def test_collection(self):
+        self.resources = ResourceCollection.from_dicts(
+            NumericResource, [r.to_dict() for r in self.resources])
+        result = response_module.sort_resources(self.resources,
+                                                [('score', True), ('id', False)])
+        self.assertIsInstance(result, ResourceCollection)
+        self.assertSortMatches([('score', True), ('id', False)])
+
+    def test_falls_back_for_other_types(self):
+        self.assertSortMatches([('name', False), ('id', True)], vectorized=False)
+        self.resources[0].id = 2 ** 63 - 1
+        self.resources[1].id = -2 ** 63
+        self.assertSortMatches([('id', True)], vectorized=False)
+
+    def test_small_collections_not_vectorized(self):
+        self.resources = self.resources[:10]
+        with mock.patch('thorium.response._numpy_order') as numpy_order:
+            response_module.sort_resources(self.resources, [('id', False)])
+        self.assertFalse(numpy_order.called)
+
+
+class TestCollectionResponsePushdown(TestCase):
+
+    def setUp(self):
+        self.request_mock = mock.MagicMock()
+        self.request_mock.fields = None
+        self.request_mock.resource_cls = ComplexResource
+        self.request_mock.params.sort = '-name,id'
+        self.request_mock.params.offset = '2'
+        self.request_mock.params.limit = '2'
+        self.response = CollectionResponse(request=self.request_mock)
+
+    def test_get_sort(self):
+        self.assertEqual(self.response.get_sort(),
+                         [('name', True), ('id', False)])
+
+    def test_get_sort_empty(self):
+        self.response.sort = None
+        self.assertEqual(self.response.get_sort(), [])
+
+    def test_get_sort_invalid(self):
+        self.response.sort = 'NotAField'
+        self.assertRaises(BadRequestError, self.response.get_sort)
+        self.response.sort = '-items'
+        self.assertRaises(BadRequestError, self.response.get_sort)
+        self.response.sort = 'id,hash_map'
+        self.assertRaises(BadRequestError, self.response.get_sort)
+
+    def test_get_pagination(self):
+        self.assertEqual(self.response.get_pagination(), (2, 2))
+
+    def test_get_pagination_none(self):
+        self.response.meta['pagination']['limit'] = None
+        self.assertEqual(self.response.get_pagination(), (None, None))
+
+    def test_get_pagination_invalid(self):
+        self.response.meta['pagination']['offset'] = -1
+        self.assertRaises(BadRequestError, self.response.get_pagination)
+        self.response.meta['pagination']['offset'] = 'abc'
+        self.assertRaises(BadRequestError, self.response.get_pagination)
+
+    def test_mark_sorted(self):
+        self.response.meta['pagination']['limit'] = None
+        self.response.resources = [
+            SimpleResource(id=2, name='b'),
+            SimpleResource(id=1, name='a'),
+        ]
+        self.response.mark_sorted()
+        data = self.response.get_response_data()
+        self.assertEqual(data[0], {'id': 2, 'name': 'b'})
+        self.assertEqual(self.response.meta['sort'], '-name,id')
+
+    def test_mark_paginated(self):
+        self.response.resources = [
+            SimpleResource(id=5, name='e'),
+            SimpleResource(id=4, name='d'),
+        ]
+        self.response.mark_paginated(total_count=10)
+        data = self.response.get_response_data()
+        self.assertEqual(len(data), 2)
+        self.assertEqual(data[0], {'id': 5, 'name': 'e'})
+        pagination = self.response.meta['pagination']
+        self.assertEqual(pagination['offset'], 2)
+        self.assertEqual(pagination['limit'], 2)
+        self.assertEqual(pagination['record_count'], 2)
+        self.assertEqual(pagination['next_page'], 4)
+        self.assertEqual(pagination['total_count'], 10)
+
+    def test_mark_paginated_empty_page(self):
+        self.response.mark_paginated()
+        self.assertEqual(self.response.get_response_data(), [])
+        pagination = self.response.meta['pagination']
+        self.assertEqual(pagination['record_count'], 0)
+        self.assertEqual(pagination['next_page'], 2)
+        self.assertNotIn('total_count', pagination)
+
+    def test_mark_paginated_invalid(self):
+        self.response.meta['pagination']['limit'] = 0
+        self.assertRaises(BadRequestError, self.response.mark_paginated)
+
+
+class TestCollectionResponseCursor(TestCase):
+
+    def setUp(self):
+        self.request_mock = mock.MagicMock()
+        self.request_mock.fields = None
+        self.request_mock.resource_cls = SimpleResource
+        self.request_mock.params.sort = '-name,id'
+        self.request_mock.params.offset = None
+        self.request_mock.params.limit = '2'
+        self.request_mock.params.cursor = None
+        self.resources = [
+            SimpleResource(id=i, name=name)
+            for i, name in enumerate(['a', 'c', None, 'c', 'b', 'd'])
+        ]
+
+    def _response(self, cursor=None):
+        self.request_mock.params.cursor = cursor
+        response = CollectionResponse(request=self.request_mock)
+        response.cursor_pagination = True
+        response.resources = list(self.resources)
+        return response
+
+    def _pages(self):
+        cursor, pages = None, []
+        while True:
+            response = self._response(cursor)
+            pages.append([r['id'] for r in response.get_response_data()])
+            cursor = response.meta['pagination']['next_cursor']
+            if cursor is None:
+                return pages
+
+    def test_walk_pages(self):
+        self.assertEqual(self._pages(), [[5, 1], [3, 4], [0, 2], []])
+
+    def test_walk_pages_ascending(self):
+        self.request_mock.params.sort = 'name,-id'
+        self.assertEqual(self._pages(), [[2, 0], [4, 3], [1, 5], []])
+
+    def test_walk_pages_duplicate_keys(self):
+        self.request_mock.params.sort = 'name'
+        self.resources = [SimpleResource(id=i, name=name)
+                          for i, name in enumerate('aaabb')]
+        self.assertEqual(self._pages(), [[0, 1], [2, 3], [4]])
+        self.request_mock.params.sort = '-name'
+        self.assertEqual(self._pages(), [[3, 4], [0, 1], [2]])
+
+    def test_cursor_key_added_to_sort(self):
+        self.request_mock.params.sort = '-name'
+        self.assertEqual(self._response().get_sort(),
+                         [('name', True), ('id', False)])
+        self.request_mock.params.sort = '-name,-id'
+        self.assertEqual(self._response().get_sort(),
+                         [('name', True), ('id', True)])
+
+    def test_cursor_not_supported(self):
+        cursor = self._response()._encode_cursor(self.resources[0])
+        response = self._response(cursor)
+        response.cursor_pagination = False
+        self.assertRaises(BadRequestError, response.get_pagination)
+
+    def test_meta(self):
+        response = self._response()
+        response.get_response_data()
+        pagination = response.meta['pagination']
+        self.assertEqual(pagination['limit'], 2)
+        self.assertIsNone(pagination['offset'])
+        self.assertIsNone(pagination['cursor'])
+        self.assertEqual(pagination['record_count'], 2)
+        next_response = self._response(pagination['next_cursor'])
+        self.assertEqual(next_response.get_cursor(), ['c', 1])
+        next_response.get_response_data()
+        self.assertEqual(next_response.meta['pagination']['cursor'],
+                         pagination['next_cursor'])
+
+    def test_get_pagination(self):
+        self.assertEqual(self._response().get_pagination(), (None, 2))
+
+    def test_get_cursor_none(self):
+        self.assertIsNone(self._response().get_cursor())
+
+    def test_get_cursor_casts_values(self):
+        payload = b'{"sort":"-name,id","values":["c","3"]}'
+        cursor = base64.urlsafe_b64encode(payload).decode('ascii')
+        self.assertEqual(self._response(cursor).get_cursor(), ['c', 3])
+
+    def test_invalid_cursor(self):
+        self.assertRaises(BadRequestError,
+                          self._response('notacursor').get_cursor)
+
+    def test_cursor_sort_mismatch(self):
+        cursor = self._response()._encode_cursor(self.resources[0])
+        self.request_mock.params.sort = 'id'
+        self.assertRaises(BadRequestError, self._response(cursor).get_cursor)
+
+    def test_cursor_and_offset(self):
+        cursor = self._response()._encode_cursor(self.resources[0])
+        response = self._response(cursor)
+        response.meta['pagination']['offset'] = 2
+        self.assertRaises(BadRequestError, response.get_pagination)
+
+    def test_cursor_without_limit(self):
+        cursor = self._response()._encode_cursor(self.resources[0])
+        response = self._response(cursor)
+        response.meta['pagination']['limit'] = None
+        self.assertRaises(BadRequestError, response.get_pagination)
+
+    def test_limit_without_sort(self):
+        self.request_mock.params.sort = None
+        response = self._response()
+        self.assertRaises(BadRequestError, response.get_pagination)
+        self.assertRaises(BadRequestError, response.get_response_data)
+
+    def test_offset_still_accepted(self):
+        self.request_mock.params.offset = '2'
+        response = self._response()
+        data = response.get_response_data()
+        self.assertEqual([r['id'] for r in data], [3, 4])
+        self.assertEqual(response.meta['pagination']['next_page'], 4)
+
+    def test_mark_paginated(self):
+        cursor = self._response()._encode_cursor(self.resources[1])
+        response = self._response(cursor)
+        self.assertEqual(response.get_cursor(), ['c', 1])
+        response.resources = [self.resources[3], self.resources[4]]
+        response.mark_paginated()
+        self.assertEqual([r['id'] for r in response.get_response_data()],
+                         [3, 4])
+        self.assertIsNotNone(response.meta['pagination']['next_cursor'])
+
+
 class TestErrorResponse(TestCase):
 
     def setUp(self):
         self.request_mock = mock.MagicMock()
+        self.request_mock.fields = None
         self.error = MethodNotAllowedError()
         self.response = ErrorResponse(http_error=self.error,
                                       request=self.request_mock)
@@ -1,4 +1,5 @@
 import unittest
+import uuid
 from unittest import mock
 from thorium import Route, RouteManager
 
@@ -25,3 +26,72 @@ class TestRouteManager(unittest.TestCase):
         routes = self.route_manager.get_all_routes()
         self.assertIn(route1, routes)
         self.assertIn(route2, routes)
+
+    def test_match(self):
+        people = Route('people', '/events/<int:event_id>/people', mock.MagicMock())
+        person = Route('person', '/events/<int:event_id>/people/<name>',
+                       mock.MagicMock())
+        self.route_manager.add_route(people)
+        self.route_manager.add_route(person)
+        self.assertEqual(self.route_manager.match('/events/3/people'),
+                         (people, {'event_id': 3}))
+        self.assertEqual(self.route_manager.match('/events/3/people/bob'),
+                         (person, {'event_id': 3, 'name': 'bob'}))
+        self.assertEqual(self.route_manager.match('/events/x/people'),
+                         (None, None))
+        self.assertEqual(self.route_manager.match('/events/3/people/bob/1'),
+                         (None, None))
+
+    def test_match_converters(self):
+        route_id = uuid.uuid4()
+        routes = [
+            Route('by_uuid', '/items/<uuid:item_id>', mock.MagicMock()),
+            Route('by_float', '/items/<float:price>', mock.MagicMock()),
+            Route('files', '/files/<name>.json', mock.MagicMock()),
+            Route('static', '/static/<path:filename>', mock.MagicMock()),
+        ]
+        for route in routes:
+            self.route_manager.add_route(route)
+        self.assertEqual(self.route_manager.match('/items/{0}'.format(route_id)),
+                         (routes[0], {'item_id': route_id}))
+        self.assertEqual(self.route_manager.match('/items/1.5'),
+                         (routes[1], {'price': 1.5}))
+        self.assertEqual(self.route_manager.match('/files/data.json'),
+                         (routes[2], {'name': 'data'}))
+        self.assertEqual(self.route_manager.match('/static/css/site.css'),
+                         (routes[3], {'filename': 'css/site.css'}))
+        self.assertEqual(self.route_manager.match('/items/abc'), (None, None))
+
+    def test_match_precedence(self):
+        by_name = Route('by_name', '/people/<name>', mock.MagicMock())
+        by_id = Route('by_id', '/people/<int:id>', mock.MagicMock())
+        me = Route('me', '/people/me', mock.MagicMock())
+        for route in (by_name, by_id, me):
+            self.route_manager.add_route(route)
+        self.assertEqual(self.route_manager.match('/people/me')[0], me)
+        self.assertEqual(self.route_manager.match('/people/3')[0], by_id)
+        self.assertEqual(self.route_manager.match('/people/bob')[0], by_name)
+
+    def test_match_precedence_path_last(self):
+        files = Route('files', '/files/<path:filename>', mock.MagicMock())
+        by_name = Route('by_name', '/files/<name>', mock.MagicMock())
+        self.route_manager.add_route(files)
+        self.route_manager.add_route(by_name)
+        self.assertEqual(self.route_manager.match('/files/data')[0], by_name)
+        self.assertEqual(self.route_manager.match('/files/a/data')[0], files)
+
+    def test_match_backtracks(self):
+        detail = Route('detail', '/<kind>/<int:id>', mock.MagicMock())
+        people = Route('people', '/people/<int:id>/friends', mock.MagicMock())
+        self.route_manager.add_route(people)
+        self.route_manager.add_route(detail)
+        self.assertEqual(self.route_manager.match('/people/3'),
+                         (detail, {'kind': 'people', 'id': 3}))
+        self.assertEqual(self.route_manager.match('/people/3/friends'),
+                         (people, {'id': 3}))
+
+    def test_match_after_adding_routes(self):
+        self.assertEqual(self.route_manager.match('/people'), (None, None))
+        route = Route('people', '/people', mock.MagicMock())
+        self.route_manager.add_route(route)
+        self.assertEqual(self.route_manager.match('/people'), (route, {}))
@@ -2,11 +2,16 @@
 
 import unittest
 import json
+import datetime
+import uuid
 
 from unittest import mock
 
+import arrow
+
 from thorium.response import CollectionResponse, DetailResponse, ErrorResponse
-from thorium.serializer import JsonSerializer
+from thorium.serializer import (JsonSerializer, JsonBackend, OrjsonBackend,
+                                handler, orjson)
 from thorium.errors import MethodNotAllowedError
 from thorium import Resource, fields
 
@@ -22,6 +27,7 @@ class TestJsonSerializer(unittest.TestCase):
         self.serializer = JsonSerializer()
         self.data = {'id': 1, 'name': 'Jim'}
         self.request = mock.MagicMock()
+        self.request.fields = None
         self.request.params = None
 
     def test_serialize_collection_response(self):
@@ -46,6 +52,43 @@ class TestJsonSerializer(unittest.TestCase):
         }
         self.assertDictEqual(data, expected_data)
 
+    def test_serialize_collection_response_stream(self):
+        self.request.params = mock.MagicMock()
+        self.request.params.sort = '-id'
+        self.request.params.offset = 1
+        self.request.params.limit = 3
+        responses = []
+        for x in range(2):
+            collection_response = CollectionResponse(request=self.request)
+            collection_response.resources = [
+                SimpleResource(id=i, name='Jim') for i in range(5)
+            ]
+            responses.append(collection_response)
+        self.serializer.stream_chunk_size = 10
+        chunks = list(self.serializer.serialize_response_stream(responses[0]))
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks:
+            self.assertIsInstance(chunk, bytes)
+        expected = self.serializer.serialize_response(responses[1])
+        self.assertEqual(b''.join(chunks).decode('utf-8'), expected)
+        data = json.loads(expected)
+        self.assertEqual([d['id'] for d in data['data']], [3, 2, 1])
+
+    def test_serialize_empty_collection_response_stream(self):
+        collection_response = CollectionResponse(request=self.request)
+        chunks = self.serializer.serialize_response_stream(collection_response)
+        data = json.loads(b''.join(chunks).decode('utf-8'))
+        self.assertEqual(data['data'], [])
+        self.assertNotIn('paginated', data['meta']['pagination'])
+
+    def test_serialize_detail_response_stream(self):
+        detail_response = DetailResponse(self.request)
+        detail_response.resource = SimpleResource(self.data)
+        chunks = list(self.serializer.serialize_response_stream(detail_response))
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(json.loads(chunks[0].decode('utf-8'))['data'],
+                         self.data)
+
     def test_serialize_empty_collection_response(self):
         collection_response = CollectionResponse(request=self.request)
         serialized_data = self.serializer.serialize_response(collection_response)
@@ -186,3 +229,212 @@ class TestJsonSerializer(unittest.TestCase):
         }
         self.assertEqual(data, expected_data)
 
+
+class DateResource(Resource):
+    id = fields.UUIDField()
+    created = fields.DateTimeField()
+    day = fields.DateField()
+    time = fields.TimeField()
+
+
+class TestJsonBackends(unittest.TestCase):
+
+    def setUp(self):
+        self.request = mock.MagicMock()
+        self.request.fields = None
+        self.request.params = None
+        self.tz = datetime.timezone(datetime.timedelta(hours=-5))
+        self.values = [
+            datetime.datetime(2015, 1, 2, 3, 4, 5),
+            datetime.datetime(2015, 1, 2, 3, 4, 5, 60),
+            datetime.datetime(2015, 1, 2, 3, 4, 5, tzinfo=self.tz),
+            datetime.datetime(2015, 1, 2, tzinfo=datetime.timezone.utc),
+            datetime.date(2015, 1, 2),
+            datetime.time(3, 4, 5),
+            datetime.time(3, 4, 5, tzinfo=self.tz),
+        ]
+
+    def test_handler_matches_arrow(self):
+        for value in self.values:
+            if isinstance(value, datetime.datetime):
+                expected = arrow.get(value).isoformat()
+            else:
+                expected = value.isoformat()
+            self.assertEqual(handler(value), expected)
+
+    def test_handler_uuid_and_bytes(self):
+        value = uuid.uuid4()
+        self.assertEqual(handler(value), str(value))
+        self.assertEqual(handler(b'abc'), 'abc')
+        self.assertRaises(TypeError, handler, {1, 2})
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_orjson_matches_json(self):
+        data = {
+            'values': self.values,
+            'id': uuid.uuid4(),
+            'bytes': b'abc',
+            'big': 2 ** 70,
+            1: 'int key',
+        }
+        self.assertEqual(json.loads(OrjsonBackend().dumps(data)),
+                         json.loads(JsonBackend().dumps(data)))
+        self.assertRaises(TypeError, OrjsonBackend().dumps, {1, 2})
+
+    def test_default_backend_float_bytes(self):
+        data = {'values': [0.1, 1e16, 1e-7, -0.0, 2 ** 0.5,
+                           float('nan'), float('inf'), float('-inf')],
+                'name': 'caf\xe9'}
+        self.assertIsInstance(JsonSerializer().backend, JsonBackend)
+        self.assertEqual(
+            JsonSerializer().backend.dumps(data),
+            '{"values": [0.1, 1e+16, 1e-07, -0.0, 1.4142135623730951, '
+            'NaN, Infinity, -Infinity], "name": "caf\\u00e9"}')
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_orjson_float_bytes(self):
+        data = {'values': [0.1, 1e16, 1e-7, -0.0, 2 ** 0.5,
+                           float('nan'), float('inf'), float('-inf')],
+                'name': 'caf\xe9'}
+        self.assertEqual(
+            OrjsonBackend().dumps(data),
+            '{"values":[0.1,1e16,1e-7,-0.0,1.4142135623730951,'
+            'null,null,null],"name":"caf\xe9"}')
+
+    def test_serializer_backend(self):
+        backend = mock.MagicMock(spec=JsonBackend)
+        backend.dumps.return_value = '{}'
+        serializer = JsonSerializer(backend=backend)
+        self.assertEqual(serializer.serialize_response(
+            DetailResponse(self.request)), '{}')
+        self.assertTrue(backend.dumps.called)
+
+    def test_stream_with_backends(self):
+        backends = [JsonBackend()]
+        if orjson is not None:
+            backends.append(OrjsonBackend())
+        for backend in backends:
+            serializer = JsonSerializer(backend=backend)
+            bodies = []
+            for x in range(2):
+                response = CollectionResponse(request=self.request)
+                response.resources = [
+                    DateResource(id=uuid.UUID(int=i),
+                                 created=datetime.datetime(2015, 1, 2),
+                                 day=datetime.date(2015, 1, 2),
+                                 time=datetime.time(3, 4, 5))
+                    for i in range(3)
+                ]
+                bodies.append(response)
+            streamed = b''.join(serializer.serialize_response_stream(bodies[0]))
+            self.assertEqual(streamed.decode('utf-8'),
+                             serializer.serialize_response(bodies[1]))
+            data = json.loads(streamed.decode('utf-8'))
+            self.assertEqual(data['data'][0]['created'],
+                             '2015-01-02T00:00:00+00:00')
+
+
+class FrozenResource(Resource):
+    _frozen = True
+    id = fields.IntField()
+    name = fields.CharField()
+    notes = fields.CharField(default=None, detail=True)
+
+
+class CompactFrozenResource(FrozenResource):
+    _compact = True
+
+
+class TestFrozenResources(unittest.TestCase):
+
+    def setUp(self):
+        self.request = mock.MagicMock()
+        self.request.fields = None
+        self.request.params = mock.MagicMock()
+        self.request.params.sort = '-id'
+        self.request.params.offset = 1
+        self.request.params.limit = 3
+        self.request.params.cursor = None
+
+    def collection(self, resource_cls, resources=None):
+        response = CollectionResponse(request=self.request)
+        response.resources = resources or [
+            resource_cls(id=i, name='Jim', notes='n') for i in range(5)]
+        return response
+
+    def test_matches_unfrozen_output(self):
+        backends = [JsonBackend()]
+        if orjson is not None:
+            backends.append(OrjsonBackend())
+        for backend in backends:
+            serializer = JsonSerializer(backend=backend)
+            for resource_cls in (FrozenResource, CompactFrozenResource):
+                expected = serializer.serialize_response(
+                    self.collection(SimpleResource, [
+                        SimpleResource(id=i, name='Jim') for i in range(5)]))
+                self.assertEqual(
+                    serializer.serialize_response(self.collection(resource_cls)),
+                    expected)
+                serializer.stream_chunk_size = 10
+                chunks = list(serializer.serialize_response_stream(
+                    self.collection(resource_cls)))
+                self.assertGreater(len(chunks), 1)
+                self.assertEqual(b''.join(chunks).decode('utf-8'), expected)
+                serializer.stream_chunk_size = 16384
+
+    def test_detail_includes_detail_fields(self):
+        serializer = JsonSerializer()
+        resource = FrozenResource(id=1, name='Jim', notes='n')
+        response = DetailResponse(self.request)
+        response.resource = resource
+        data = json.loads(serializer.serialize_response(response))['data']
+        self.assertEqual(data, {'id': 1, 'name': 'Jim', 'notes': 'n'})
+        streamed = b''.join(serializer.serialize_response_stream(response))
+        self.assertEqual(streamed.decode('utf-8'),
+                         serializer.serialize_response(response))
+
+    def test_serialized_json_is_cached(self):
+        serializer = JsonSerializer()
+        resources = [FrozenResource(id=i, name='Jim') for i in range(5)]
+        serializer.serialize_response(self.collection(FrozenResource, resources))
+        with mock.patch.object(serializer, '_serialize_data',
+                               wraps=serializer._serialize_data) as serialize:
+            serializer.serialize_response(self.collection(FrozenResource, resources))
+        # only the envelope and the meta
+        self.assertEqual(serialize.call_count, 2)
+
+    def test_sparse_fieldsets_not_cached(self):
+        serializer = JsonSerializer()
+        resource = FrozenResource(id=1, name='Jim', notes='n')
+        response = DetailResponse(self.request)
+        response.resource = resource
+        serializer.serialize_response(response)
+        self.assertEqual(len(resource._serialized), 1)
+        for fields in (('id',), ('name',), ('id', 'notes')):
+            self.request.fields = fields
+            response = DetailResponse(self.request)
+            response.resource = resource
+            data = json.loads(serializer.serialize_response(response))['data']
+            self.assertEqual(set(data), set(fields))
+        self.assertEqual(len(resource._serialized), 1)
+
+    def test_set_discards_cache(self):
+        serializer = JsonSerializer()
+        resource = FrozenResource(id=1, name='Jim')
+        response = DetailResponse(self.request)
+        response.resource = resource
+        serializer.serialize_response(response)
+        resource.name = 'Bob'
+        data = json.loads(serializer.serialize_response(response))['data']
+        self.assertEqual(data['name'], 'Bob')
+        resource.from_dict({'name': 'Tim'})
+        data = json.loads(serializer.serialize_response(response))['data']
+        self.assertEqual(data['name'], 'Tim')
+
+    def test_mixed_collection(self):
+        serializer = JsonSerializer()
+        resources = [FrozenResource(id=1, name='Jim'), SimpleResource(id=2, name='Bob')]
+        self.request.params = None
+        data = json.loads(serializer.serialize_response(
+            self.collection(FrozenResource, resources)))['data']
+        self.assertEqual(data, [{'id': 1, 'name': 'Jim'}, {'id': 2, 'name': 'Bob'}])
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import json
+import unittest
+
+from thorium import (
+    ThoriumASGI,
+    RouteManager,
+    Resource,
+    fields,
+    AsyncEndpoint,
+    Endpoint,
+    auth,
+    errors,
+)
+
+routing = RouteManager()
+
+
+class TokenAuthenticator(auth.AsyncAuthenticator):
+
+    async def _authenticate(self):
+        await asyncio.sleep(0)
+        return self.request.method != 'DELETE'
+
+    def _authorize(self):
+        return True
+
+
+class PersonResource(Resource):
+    id = fields.IntField(default=None)
+    name = fields.CharField()
+
+
+class CollectionParams(Resource):
+    times = fields.IntField(required=True, default=1)
+
+
+@auth.use(TokenAuthenticator)
+@routing.collection(path='/api/event/<int:event_id>/people',
+                    methods=('get', 'post'),
+                    parameters_cls=CollectionParams)
+@routing.detail(path='/api/event/<int:event_id>/people/<int:id>',
+                methods=('get', 'delete'))
+class AsyncPersonEndpoint(AsyncEndpoint):
+    Resource = PersonResource
+    _authenticator_classes = None
+
+    async def pre_request(self):
+        await asyncio.sleep(0)
+        self.name = 'Timmy'
+
+    async def get_detail(self):
+        if self.request.identifiers['id'] == 404:
+            raise errors.ResourceNotFoundError()
+        self.response.resource = PersonResource(id=self.request.identifiers['id'],
+                                                name=self.name)
+
+    async def get_collection(self):
+        for x in range(self.request.params.times):
+            await asyncio.sleep(0)
+            self.response.resources.append(PersonResource(id=x, name=self.name))
+
+    def post_collection(self):
+        self.response.resource = PersonResource(self.request.resource)
+
+    async def delete_detail(self):
+        pass
+
+
+@routing.detail(path='/api/sync/<name>', methods=('get',))
+class SyncPersonEndpoint(Endpoint):
+    Resource = PersonResource
+    stream_response = True
+
+    def get_detail(self):
+        self.response.resource = PersonResource(
+            id=1, name=self.request.identifiers['name'])
+
+
+def call(app, method, path, query_string=b'', body=b'', headers=()):
+    scope = {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'query_string': query_string,
+        'headers': [(b'host', b'testserver')] + list(headers),
+    }
+    messages = [{'type': 'http.request', 'body': body}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    status = sent[0]['status']
+    response_headers = {k.decode(): v.decode() for k, v in sent[0]['headers']}
+    response_body = b''.join(m['body'] for m in sent[1:])
+    return status, response_headers, response_body
+
+
+class TestThoriumASGI(unittest.TestCase):
+
+    def setUp(self):
+        self.app = ThoriumASGI(settings={}, route_manager=routing)
+
+    def test_async_detail_get(self):
+        status, headers, body = call(self.app, 'GET', '/api/event/1/people/7')
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['content-type'], 'application/json')
+        self.assertEqual(headers['access-control-allow-origin'], '*')
+        self.assertEqual(json.loads(body.decode())['data'],
+                         {'id': 7, 'name': 'Timmy'})
+
+    def test_async_collection_get(self):
+        status, headers, body = call(self.app, 'GET', '/api/event/1/people',
+                                     query_string=b'times=3&sort=-id')
+        self.assertEqual(status, 200)
+        data = json.loads(body.decode())['data']
+        self.assertEqual([p['id'] for p in data], [2, 1, 0])
+
+    def test_sync_method_on_async_endpoint(self):
+        status, headers, body = call(
+            self.app, 'POST', '/api/event/1/people',
+            body=b'{"name": "Jim"}',
+            headers=[(b'content-type', b'application/json')],
+        )
+        self.assertEqual(status, 201)
+        self.assertEqual(json.loads(body.decode())['data'],
+                         {'id': None, 'name': 'Jim'})
+
+    def test_async_authenticator(self):
+        status, headers, body = call(self.app, 'DELETE', '/api/event/1/people/7')
+        self.assertEqual(status, 401)
+
+    def test_http_error(self):
+        status, headers, body = call(self.app, 'GET', '/api/event/1/people/404')
+        self.assertEqual(status, 404)
+        self.assertEqual(json.loads(body.decode())['status'], 404)
+
+    def test_method_not_allowed(self):
+        status, headers, body = call(
+            self.app, 'PUT', '/api/event/1/people/7', body=b'{}',
+            headers=[(b'content-type', b'application/json')],
+        )
+        self.assertEqual(status, 405)
+        self.assertEqual(headers['allow'], 'DELETE, GET')
+
+    def test_invalid_query_parameter(self):
+        status, headers, body = call(self.app, 'GET', '/api/event/1/people',
+                                     query_string=b'bad=1')
+        self.assertEqual(status, 400)
+
+    def test_invalid_json(self):
+        status, headers, body = call(
+            self.app, 'POST', '/api/event/1/people', body=b'{bad',
+            headers=[(b'content-type', b'application/json')],
+        )
+        self.assertEqual(status, 400)
+
+    def test_route_not_found(self):
+        status, headers, body = call(self.app, 'GET', '/api/nothing')
+        self.assertEqual(status, 404)
+
+    def test_options(self):
+        status, headers, body = call(self.app, 'OPTIONS', '/api/event/1/people')
+        self.assertEqual(status, 200)
+        self.assertIn('GET', headers['allow'])
+
+    def test_head(self):
+        expected = call(self.app, 'GET', '/api/event/1/people/7')
+        status, headers, body = call(self.app, 'HEAD', '/api/event/1/people/7')
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['content-length'], str(len(expected[2])))
+        self.assertEqual(body, b'')
+        status, headers, body = call(self.app, 'HEAD', '/api/sync/Jim')
+        self.assertEqual(status, 200)
+        self.assertEqual(body, b'')
+
+    def test_sync_streamed_endpoint(self):
+        status, headers, body = call(self.app, 'GET', '/api/sync/Jim')
+        self.assertEqual(status, 200)
+        self.assertNotIn('content-length', headers)
+        self.assertEqual(json.loads(body.decode())['data'],
+                         {'id': 1, 'name': 'Jim'})
+
+    def test_dispatch_async_endpoint_synchronously(self):
+        route = [r for r in routing.get_all_routes()
+                 if r.name == 'AsyncPersonEndpoint_detail'][0]
+        request = unittest.mock.MagicMock()
+        request.method = 'GET'
+        request.identifiers = {'id': 3}
+        request.fields = None
+        response, body = route.dispatcher.dispatch(request)
+        self.assertEqual(json.loads(body)['data'], {'id': 3, 'name': 'Timmy'})
+
+    def test_dispatch_async_endpoint_in_running_loop(self):
+        route = [r for r in routing.get_all_routes()
+                 if r.name == 'AsyncPersonEndpoint_detail'][0]
+        request = unittest.mock.MagicMock()
+        request.method = 'GET'
+
+        async def dispatch():
+            return route.dispatcher.dispatch(request)
+
+        with self.assertRaisesRegex(RuntimeError, 'dispatch_async'):
+            asyncio.run(dispatch())
@@ -3,6 +3,7 @@
 import unittest
 import json
 import datetime
+import gzip
 
 from collections import OrderedDict
 
@@ -64,6 +65,50 @@ class PersonEndpoint(Endpoint):
         self.response.location_header(4)
 
 
+@routing.collection(path='/api/event/<int:event_id>/streamed_people',
+                    methods=('get',),
+                    parameters_cls=CollectionParams)
+class StreamedPersonEndpoint(PersonEndpoint):
+    stream_response = True
+
+
+@routing.collection(path='/api/event/<int:event_id>/paged_people',
+                    methods=('get',),
+                    parameters_cls=CollectionParams)
+class PagedPersonEndpoint(PersonEndpoint):
+
+    def get_collection(self):
+        rows = [dict(self.data, id=x) for x in range(self.request.params.times)]
+        for field, descending in reversed(self.response.get_sort()):
+            rows.sort(key=lambda row: row[field], reverse=descending)
+        offset, limit = self.response.get_pagination()
+        if offset is not None:
+            self.response.resources = [
+                PersonResource(row) for row in rows[offset:offset + limit]
+            ]
+            self.response.mark_paginated(total_count=len(rows))
+
+
+@routing.collection(path='/api/event/<int:event_id>/projected_people',
+                    methods=('get',),
+                    parameters_cls=CollectionParams)
+class ProjectedPersonEndpoint(PersonEndpoint):
+
+    def get_collection(self):
+        # load only the requested fields
+        names = self.request.fields or [n for n, _ in PersonResource.all_fields()]
+        for x in range(self.request.params.times):
+            self.data['id'] = x
+            person = PersonResource.partial({n: self.data[n] for n in names})
+            self.response.resources.append(person)
+
+
+@routing.detail(path='/api/event/<int:event_id>/tagged_people/<int:id>',
+                methods=('get',))
+class TaggedPersonEndpoint(PersonEndpoint):
+    etag_response = True
+
+
 class TestThoriumFlask(unittest.TestCase):
 
     def setUp(self):
@@ -83,6 +128,14 @@ class TestThoriumFlask(unittest.TestCase):
         self.assertEqual(data['admin'], True)
         self.assertEqual(data['id'], 42)
 
+    def test_head(self):
+        expected = self.c.open('/api/event/1/people/1', method='GET')
+        rv = self.c.open('/api/event/1/people/1', method='HEAD')
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(rv.headers['Content-Length'],
+                         expected.headers['Content-Length'])
+        self.assertEqual(rv.data, b'')
+
     def test_simple_list_get(self):
         rv = self.c.open('/api/event/1/people', method='GET')
         self.assertEqual(rv.status_code, 200)
@@ -292,6 +345,91 @@ class TestThoriumFlask(unittest.TestCase):
         self.assertEqual(items[0]['id'], 2)
         self.assertEqual(items[1]['id'], 1)
 
+    def test_get_streamed(self):
+        rv = self.c.open(
+            '/api/event/1/streamed_people?times=5&sort=-id&offset=2&limit=2',
+            method='GET'
+        )
+        self.assertEqual(rv.status_code, 200)
+        self.assertTrue(rv.is_streamed)
+        expected = self.c.open(
+            '/api/event/1/people?times=5&sort=-id&offset=2&limit=2',
+            method='GET'
+        )
+        self.assertEqual(rv.data, expected.data)
+
+    def test_get_streamed_invalid_sort(self):
+        rv = self.c.open('/api/event/1/streamed_people?times=5&sort=+YO',
+                         method='GET')
+        self.assertEqual(rv.status_code, 400)
+
+    def test_get_paged(self):
+        rv = self.c.open(
+            '/api/event/1/paged_people?times=5&sort=-id&offset=2&limit=2',
+            method='GET'
+        )
+        self.assertEqual(rv.status_code, 200)
+        body = json.loads(rv.data.decode())
+        self.assertEqual([item['id'] for item in body['data']], [2, 1])
+        self.assertEqual(
+            body['meta']['pagination'],
+            {
+                'limit': 2,
+                'offset': 2,
+                'record_count': 2,
+                'next_page': 4,
+                'total_count': 5,
+            }
+        )
+
+        rv = self.c.open(
+            '/api/event/1/paged_people?times=5&sort=-nope&offset=2&limit=2',
+            method='GET'
+        )
+        self.assertEqual(rv.status_code, 400)
+
+    def test_get_with_fields(self):
+        rv = self.c.open('/api/event/1/people?times=2&fields=name,id',
+                         method='GET')
+        self.assertEqual(rv.status_code, 200)
+        items = json.loads(rv.data.decode())['data']
+        self.assertEqual(items, [{'id': 0, 'name': 'Timmy'},
+                                 {'id': 1, 'name': 'Timmy'}])
+        self.assertEqual(list(items[0]), ['id', 'name'])
+
+    def test_get_with_fields_invalid(self):
+        rv = self.c.open('/api/event/1/people?fields=name,age', method='GET')
+        self.assertEqual(rv.status_code, 400)
+        self.assertIn('age', json.loads(rv.data.decode())['error'])
+
+    def test_get_with_fields_and_sort(self):
+        rv = self.c.open(
+            '/api/event/1/streamed_people?times=3&fields=admin&sort=-id',
+            method='GET')
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(json.loads(rv.data.decode())['data'],
+                         [{'admin': True}] * 3)
+
+    def test_fields_pushed_to_endpoint(self):
+        rv = self.c.open('/api/event/1/projected_people?times=2&fields=name',
+                         method='GET')
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(json.loads(rv.data.decode())['data'],
+                         [{'name': 'Timmy'}] * 2)
+
+    def test_conditional_get(self):
+        rv = self.c.open('/api/event/1/tagged_people/1', method='GET')
+        self.assertEqual(rv.status_code, 200)
+        etag = rv.headers['ETag']
+        rv = self.c.open('/api/event/1/tagged_people/1', method='GET',
+                         headers={'If-None-Match': etag})
+        self.assertEqual(rv.status_code, 304)
+        self.assertEqual(rv.data, b'')
+        self.assertEqual(rv.headers['ETag'], etag)
+        rv = self.c.open('/api/event/1/tagged_people/1', method='GET',
+                         headers={'If-None-Match': '"other"'})
+        self.assertEqual(rv.status_code, 200)
+
     def test_post_simple(self):
         data = {
             'name': 'Snoopy',
@@ -348,6 +486,74 @@ class TestThoriumFlask(unittest.TestCase):
         self.assertEqual(rv.status_code, 400)
 
 
+class TestThoriumFlaskCompression(unittest.TestCase):
+
+    def setUp(self):
+        self.flask_app = Flask(__name__)
+        self.flask_app.config['THORIUM_COMPRESS'] = True
+        self.flask_app.config['THORIUM_COMPRESS_MIN_SIZE'] = 400
+        ThoriumFlask(
+            settings={},
+            route_manager=routing,
+            flask_app=self.flask_app
+        )
+        self.c = self.flask_app.test_client()
+
+    def test_gzip(self):
+        expected = self.c.open('/api/event/1/people?times=20', method='GET')
+        self.assertNotIn('Content-Encoding', expected.headers)
+        self.assertEqual(expected.headers['Vary'], 'Accept-Encoding')
+        rv = self.c.open('/api/event/1/people?times=20', method='GET',
+                         headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(rv.headers['Content-Encoding'], 'gzip')
+        self.assertLess(len(rv.data), len(expected.data))
+        self.assertEqual(gzip.decompress(rv.data), expected.data)
+
+    def test_small_response_not_compressed(self):
+        rv = self.c.open('/api/event/1/people/1', method='GET',
+                         headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', rv.headers)
+        self.assertEqual(json.loads(rv.data.decode())['data']['id'], 42)
+
+    def test_streamed_gzip(self):
+        url = '/api/event/1/streamed_people?times=20'
+        expected = self.c.open(url, method='GET')
+        rv = self.c.open(url, method='GET', headers={'Accept-Encoding': 'gzip'})
+        self.assertTrue(rv.is_streamed)
+        self.assertEqual(rv.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(rv.data), expected.data)
+
+    def test_conditional_get(self):
+        rv = self.c.open('/api/event/1/tagged_people/1', method='GET',
+                         headers={'Accept-Encoding': 'gzip'})
+        etag = rv.headers['ETag']
+        rv = self.c.open('/api/event/1/tagged_people/1', method='GET',
+                         headers={'Accept-Encoding': 'gzip',
+                                  'If-None-Match': etag})
+        self.assertEqual(rv.status_code, 304)
+        self.assertEqual(rv.data, b'')
+        self.assertNotIn('Content-Encoding', rv.headers)
+
+    def test_not_modified_etag_matches(self):
+        flask_app = Flask(__name__)
+        flask_app.config['THORIUM_COMPRESS'] = True
+        flask_app.config['THORIUM_COMPRESS_MIN_SIZE'] = 0
+        ThoriumFlask(settings={}, route_manager=routing, flask_app=flask_app)
+        self.c = flask_app.test_client()
+        rv = self.c.open('/api/event/1/tagged_people/1', method='GET',
+                         headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(rv.headers['Content-Encoding'], 'gzip')
+        etag = rv.headers['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        rv = self.c.open('/api/event/1/tagged_people/1', method='GET',
+                         headers={'Accept-Encoding': 'gzip',
+                                  'If-None-Match': etag})
+        self.assertEqual(rv.status_code, 304)
+        self.assertEqual(rv.data, b'')
+        self.assertEqual(rv.headers['ETag'], etag)
+
+
 class TestResourceSpeed(unittest.TestCase):
 
     def setUp(self):
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import unittest
+
+from wsgiref.util import setup_testing_defaults
+
+from thorium import (
+    ThoriumWSGI,
+    RouteManager,
+    Parameters,
+    Resource,
+    fields,
+    params,
+    Endpoint,
+)
+
+routing = RouteManager()
+
+
+class PersonResource(Resource):
+    id = fields.IntField(default=None)
+    name = fields.CharField()
+
+
+class CollectionParams(Parameters):
+    times = params.IntParam(default=1)
+
+
+@routing.collection(path='/api/event/<int:event_id>/people',
+                    methods=('get', 'post'),
+                    parameters_cls=CollectionParams)
+@routing.detail(path='/api/event/<int:event_id>/people/<int:id>',
+                methods=('get', 'patch'))
+class PersonEndpoint(Endpoint):
+    Resource = PersonResource
+
+    def get_detail(self):
+        self.response.resource = PersonResource(
+            id=self.request.identifiers['id'], name='Timmy')
+
+    def get_collection(self):
+        for x in range(self.request.params['times']):
+            self.response.resources.append(PersonResource(id=x, name='Timmy'))
+
+    def post_collection(self):
+        self.response.resource = PersonResource(self.request.resource)
+        self.response.location_header(4)
+
+    def patch_detail(self):
+        resource = PersonResource.partial(self.request.resource)
+        self.response.resource = resource
+
+
+@routing.collection(path='/api/streamed_people', methods=('get',))
+class StreamedPersonEndpoint(PersonEndpoint):
+    stream_response = True
+
+    def get_collection(self):
+        self.response.resources = [PersonResource(id=x, name='Timmy')
+                                   for x in range(3)]
+
+
+@routing.collection(path='/api/event/<int:event_id>/decoded_people',
+                    methods=('post',))
+class DecodedPersonEndpoint(PersonEndpoint):
+    decode_resources = True
+
+    def post_collection(self):
+        assert all(isinstance(r, PersonResource) for r in self.request.resources)
+        self.response.status_code = 200
+        self.response.resource = self.request.resources[-1]
+
+
+def call(app, method, path, query_string='', body=b'', content_type=None):
+    environ = {
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'QUERY_STRING': query_string,
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body),
+    }
+    if content_type:
+        environ['CONTENT_TYPE'] = content_type
+    setup_testing_defaults(environ)
+    started = {}
+
+    def start_response(status, headers):
+        started['status'] = status
+        started['headers'] = dict(headers)
+
+    response_body = b''.join(app(environ, start_response))
+    return started['status'], started['headers'], response_body
+
+
+class TestThoriumWSGI(unittest.TestCase):
+
+    def setUp(self):
+        self.app = ThoriumWSGI(settings={}, route_manager=routing)
+
+    def test_detail_get(self):
+        status, headers, body = call(self.app, 'GET', '/api/event/1/people/7')
+        self.assertEqual(status, '200 OK')
+        self.assertEqual(headers['Content-Type'], 'application/json')
+        self.assertEqual(headers['Access-Control-Allow-Origin'], '*')
+        self.assertEqual(headers['Content-Length'], str(len(body)))
+        self.assertEqual(json.loads(body.decode())['data'],
+                         {'id': 7, 'name': 'Timmy'})
+
+    def test_collection_get(self):
+        status, headers, body = call(self.app, 'GET', '/api/event/1/people',
+                                     query_string='times=3')
+        self.assertEqual(status, '200 OK')
+        data = json.loads(body.decode())['data']
+        self.assertEqual([p['id'] for p in data], [0, 1, 2])
+
+    def test_post(self):
+        status, headers, body = call(self.app, 'POST', '/api/event/1/people',
+                                     body=b'{"name": "Jim"}',
+                                     content_type='application/json')
+        self.assertEqual(status, '201 Created')
+        self.assertEqual(headers['Location'],
+                         'http://127.0.0.1/api/event/1/people/4')
+        self.assertEqual(json.loads(body.decode())['data'],
+                         {'id': None, 'name': 'Jim'})
+
+    def test_patch_uses_identifiers(self):
+        status, headers, body = call(self.app, 'PATCH', '/api/event/1/people/9',
+                                     body=b'{"name": "Jim"}',
+                                     content_type='application/json')
+        self.assertEqual(status, '200 OK')
+        self.assertEqual(json.loads(body.decode())['data'],
+                         {'id': 9, 'name': 'Jim'})
+
+    def test_unsupported_mimetype(self):
+        status, headers, body = call(self.app, 'POST', '/api/event/1/people',
+                                     body=b'name=Jim',
+                                     content_type='text/plain')
+        self.assertEqual(status, '400 Bad Request')
+
+    def test_invalid_query_parameter(self):
+        status, headers, body = call(self.app, 'GET', '/api/event/1/people',
+                                     query_string='times=abc')
+        self.assertEqual(status, '400 Bad Request')
+
+    def test_route_not_found(self):
+        status, headers, body = call(self.app, 'GET', '/api/nothing')
+        self.assertEqual(status, '404 Not Found')
+        self.assertEqual(json.loads(body.decode())['status'], 404)
+
+    def test_method_not_allowed(self):
+        status, headers, body = call(self.app, 'DELETE', '/api/event/1/people/7')
+        self.assertEqual(status, '405 Method Not Allowed')
+        self.assertEqual(headers['Allow'], 'GET, PATCH')
+
+    def test_options(self):
+        status, headers, body = call(self.app, 'OPTIONS', '/api/event/1/people')
+        self.assertEqual(status, '200 OK')
+        self.assertIn('GET', headers['Allow'])
+
+    def test_head(self):
+        expected = call(self.app, 'GET', '/api/event/1/people/7')
+        status, headers, body = call(self.app, 'HEAD', '/api/event/1/people/7')
+        self.assertEqual(status, '200 OK')
+        self.assertEqual(headers['Content-Length'], str(len(expected[2])))
+        self.assertEqual(body, b'')
+        status, headers, body = call(self.app, 'HEAD', '/api/streamed_people')
+        self.assertEqual(status, '200 OK')
+        self.assertEqual(body, b'')
+
+    def test_streamed(self):
+        status, headers, body = call(self.app, 'GET', '/api/streamed_people')
+        self.assertEqual(status, '200 OK')
+        self.assertNotIn('Content-Length', headers)
+        self.assertEqual(len(json.loads(body.decode())['data']), 3)
+
+    def test_decoded_post(self):
+        status, headers, body = call(self.app, 'POST', '/api/event/1/decoded_people',
+                                     body=b'[{"id": 1, "name": "Jim"}, {"name": "Bob"}]',
+                                     content_type='application/json')
+        self.assertEqual(status, '200 OK')
+        data = json.loads(body.decode())['data']
+        self.assertEqual(data, {'id': None, 'name': 'Bob'})
+
+    def test_decoded_post_unknown_field(self):
+        status, headers, body = call(self.app, 'POST', '/api/event/1/decoded_people',
+                                     body=b'{"name": "Jim", "age": 5}',
+                                     content_type='application/json')
+        self.assertEqual(status, '400 Bad Request')
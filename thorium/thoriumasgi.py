@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+from . import Thorium, errors
+from .native import (NativeEndpoint, OPTIONS_ALLOW, decode_headers,
+                     prepare_body, response_headers)
+
+
+class ThoriumASGI(Thorium):
+    """
+    Serves the routes of a :class:`.RouteManager` as an ASGI application,
+    without Flask. Requests to an :class:`.AsyncEndpoint` are awaited through
+    :meth:`.DispatcherBase.dispatch_async`, other endpoints are dispatched
+    synchronously on the event loop.
+
+    Usage::
+
+        app = ThoriumASGI(settings={}, route_manager=routes)
+        # uvicorn module:app
+    """
+
+    def __init__(self, settings, route_manager, debug=False):
+        super(ThoriumASGI, self).__init__(
+            settings=settings,
+            route_manager=route_manager,
+            debug=debug,
+        )
+
+    def _bind_routes(self):
+        self._endpoints = {}
+        for r in self._route_manager.get_all_routes():
+            if r.path:
+                self._endpoints[r] = ASGIEndpoint(
+                    dispatcher=r.dispatcher,
+                    exception_handler=self.exception_handler,
+                )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise ValueError('Unsupported ASGI scope type {0}'
+                             .format(scope['type']))
+
+        route, view_args = self._route_manager.match(scope['path'])
+        endpoint = self._endpoints.get(route)
+        if endpoint is None:
+            error_body = self.exception_handler.handle_http_exception(
+                http_error=errors.ResourceNotFoundError(),
+                request=None,
+            )
+            await send_response(send, scope['method'], 404,
+                                response_headers({}, scope_headers(scope)),
+                                error_body)
+            return
+        await endpoint.endpoint_target(scope, receive, send, view_args)
+
+    @staticmethod
+    async def _lifespan(receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+class ASGIEndpoint(NativeEndpoint):
+
+    async def endpoint_target(self, scope, receive, send, view_args):
+        url = method = 'unknown'
+        request = None
+        request_headers = scope_headers(scope)
+        if scope['method'] == 'OPTIONS':
+            headers = response_headers({'Allow': OPTIONS_ALLOW}, request_headers)
+            await send_response(send, 'OPTIONS', 200, headers, b'')
+            return
+        try:
+            body = await read_body(receive)
+            request = self.build_request(
+                method=scope['method'],
+                url=build_url(scope, request_headers),
+                headers=request_headers,
+                query_string=scope['query_string'],
+                body=body,
+                view_args=view_args,
+            )
+            url = request.url
+            method = request.method
+            response, serialized_body = await self.dispatcher.dispatch_async(request)
+            status, headers = response.status_code, response.headers
+        except errors.HttpErrorBase as e:
+            status, headers, serialized_body = self.handle_http_exception(e, request)
+        except Exception as e:
+            status, headers, serialized_body = self.handle_general_exception(
+                e, request, url, method)
+        await send_response(send, scope['method'], status,
+                            response_headers(headers, request_headers),
+                            serialized_body)
+
+
+async def read_body(receive):
+    body = b''
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get('body', b'')
+        more_body = message.get('more_body', False)
+    return body
+
+
+async def send_response(send, method, status, headers, body):
+    """
+    Sends a serialized response body, either a string or an iterator of byte
+    chunks from a streamed response.
+    """
+    body = prepare_body(method, status, headers, body)
+    raw_headers = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                   for name, value in headers]
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': raw_headers})
+
+    if isinstance(body, bytes):
+        await send({'type': 'http.response.body', 'body': body})
+        return
+    for chunk in body:
+        await send({'type': 'http.response.body', 'body': chunk,
+                    'more_body': True})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+def scope_headers(scope):
+    return decode_headers((name.decode('latin-1'), value.decode('latin-1'))
+                          for name, value in scope.get('headers', ()))
+
+
+def build_url(scope, headers):
+    host = headers.get('host')
+    if host is None:
+        server = scope.get('server') or ('localhost', None)
+        host = server[0] if server[1] is None else '{0}:{1}'.format(*server)
+    url = '{0}://{1}{2}{3}'.format(scope.get('scheme', 'http'), host,
+                                   scope.get('root_path', ''), scope['path'])
+    if scope.get('query_string'):
+        url += '?' + scope['query_string'].decode('latin-1')
+    return url
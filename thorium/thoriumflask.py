@@ -6,6 +6,7 @@ from flask import Response as FlaskResponse, request as flaskrequest
 from werkzeug.exceptions import BadRequest as WerkzeugBadRequest
 
 from . import Thorium, errors
+from .compression import Compressor, negotiate_encoding
 from .request import Request
 from .resources import VALID_METHODS, VALID_QUERY_PARAMETERS
 from .parameters import ParametersMetaClass
@@ -13,6 +14,15 @@ from .crossdomain_decorator import crossdomain
 
 
 class ThoriumFlask(Thorium):
+    """
+    Binds the routes of a :class:`.RouteManager` to a Flask application.
+
+    Responses are compressed for clients accepting gzip, or brotli when it is
+    installed, if the ``THORIUM_COMPRESS`` flask config value is True when
+    routes are bound. ``THORIUM_COMPRESS_MIN_SIZE``,
+    ``THORIUM_COMPRESS_LEVEL`` and ``THORIUM_COMPRESS_BROTLI_QUALITY`` tune
+    the :class:`.Compressor`.
+    """
 
     def __init__(self, settings, route_manager, flask_app):
         self._flask_app = flask_app
@@ -47,6 +57,13 @@ class FlaskEndpoint(object):
         self.dispatcher = dispatcher
         # should this just have a reference to the thorium object?
         self.exception_handler = exception_handler
+        self.compressor = None
+        if flask_config.get('THORIUM_COMPRESS', False):
+            self.compressor = Compressor(
+                min_size=flask_config.get('THORIUM_COMPRESS_MIN_SIZE', 1024),
+                level=flask_config.get('THORIUM_COMPRESS_LEVEL', 6),
+                brotli_quality=flask_config.get('THORIUM_COMPRESS_BROTLI_QUALITY', 5),
+            )
 
     @crossdomain(origin='*')
     def endpoint_target(self, **kwargs):
@@ -57,9 +74,17 @@ class FlaskEndpoint(object):
             url = request.url
             method = request.method
             response, serialized_body = self.dispatcher.dispatch(request)
+            headers = response.headers
+            if self.compressor is not None:
+                serialized_body, headers = self.compressor.compress_response(
+                    serialized_body,
+                    headers,
+                    negotiate_encoding(flaskrequest.headers.get('Accept-Encoding')),
+                    response.status_code,
+                )
             return FlaskResponse(
                 response=serialized_body,
-                headers=response.headers,
+                headers=headers,
                 status=response.status_code,
                 content_type='application/json',
             )
@@ -93,7 +118,14 @@ class FlaskEndpoint(object):
             resource = None
             resources = []
             if flaskrequest.method.lower() in {'post', 'patch', 'put'}:
-                if flaskrequest.mimetype == 'application/json':
+                decoder = getattr(self.dispatcher, 'decoder', None)
+                if flaskrequest.mimetype == 'application/json' and decoder is not None:
+                    resource, resources = decoder.decode(
+                        flaskrequest.get_data(),
+                        flaskrequest.method == 'PATCH',
+                        flaskrequest.view_args,
+                    )
+                elif flaskrequest.mimetype == 'application/json':
                     json_data = flaskrequest.json or {}
                     partial = True if flaskrequest.method == 'PATCH' else False
 
@@ -109,15 +141,18 @@ class FlaskEndpoint(object):
                         'Currently only json is supported, use application/'
                         'json mimetype')
 
+            # HEAD is dispatched as GET, werkzeug drops the body
+            method = 'GET' if flaskrequest.method == 'HEAD' else flaskrequest.method
             return Request(
                 dispatcher=self.dispatcher,
-                method=flaskrequest.method,
+                method=method,
                 identifiers=flaskrequest.view_args,
                 query_params=self._build_parameters(),
                 mimetype=flaskrequest.mimetype,
                 resource=resource,
                 resources=resources,
                 url=flaskrequest.url,
+                headers=flaskrequest.headers,
             )
         except (errors.ValidationError, WerkzeugBadRequest) as e:
             raise errors.BadRequestError(message=e.args[0] if e.args else None)
@@ -131,11 +166,11 @@ class FlaskEndpoint(object):
         if not self.dispatcher.Parameters:
             return None
 
-        flask_params = flaskrequest.args.to_dict() if flaskrequest.args else {}
-
         if isinstance(self.dispatcher.Parameters, ParametersMetaClass):
-            return self.dispatcher.Parameters.validate(flask_params)
+            return self.dispatcher.Parameters.validate_query_string(
+                flaskrequest.query_string)
         else:
+            flask_params = flaskrequest.args.to_dict() if flaskrequest.args else {}
             self._validate_no_extra_query_params(flask_params)
             flask_params.update(flaskrequest.view_args)
             params = self.dispatcher.Parameters.init_from_dict(
@@ -148,6 +183,10 @@ class FlaskEndpoint(object):
                 params.offset = flask_params.get('offset')
             if not hasattr(params, 'limit'):
                 params.limit = flask_params.get('limit')
+            if not hasattr(params, 'cursor'):
+                params.cursor = flask_params.get('cursor')
+            if not hasattr(params, 'fields'):
+                params.fields = flask_params.get('fields')
             return params
 
     def _validate_no_extra_query_params(self, flask_params):
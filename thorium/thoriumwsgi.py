@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+from wsgiref.util import request_uri
+
+from . import Thorium, errors
+from .native import (NativeEndpoint, OPTIONS_ALLOW, decode_headers,
+                     prepare_body, response_headers, status_line)
+
+
+class ThoriumWSGI(Thorium):
+    """
+    Serves the routes of a :class:`.RouteManager` as a WSGI application,
+    routing and building each :class:`.Request` straight from the environ
+    rather than through Flask's request context.
+
+    Usage::
+
+        app = ThoriumWSGI(settings={}, route_manager=routes)
+        # gunicorn module:app
+    """
+
+    def __init__(self, settings, route_manager, debug=False):
+        super(ThoriumWSGI, self).__init__(
+            settings=settings,
+            route_manager=route_manager,
+            debug=debug,
+        )
+
+    def _bind_routes(self):
+        self._endpoints = {}
+        for r in self._route_manager.get_all_routes():
+            if r.path:
+                self._endpoints[r] = WSGIEndpoint(
+                    dispatcher=r.dispatcher,
+                    exception_handler=self.exception_handler,
+                )
+
+    def __call__(self, environ, start_response):
+        # PEP 3333 paths are bytes decoded as latin-1
+        path = environ.get('PATH_INFO', '').encode('latin-1').decode('utf-8', 'replace')
+        route, view_args = self._route_manager.match(path)
+        endpoint = self._endpoints.get(route)
+        if endpoint is None:
+            error_body = self.exception_handler.handle_http_exception(
+                http_error=errors.ResourceNotFoundError(),
+                request=None,
+            )
+            headers = response_headers({}, decode_headers(environ_headers(environ)))
+            return send_response(start_response, environ['REQUEST_METHOD'], 404,
+                                 headers, error_body)
+        return endpoint.endpoint_target(environ, start_response, view_args)
+
+
+class WSGIEndpoint(NativeEndpoint):
+
+    def endpoint_target(self, environ, start_response, view_args):
+        url = method = 'unknown'
+        request = None
+        request_method = environ['REQUEST_METHOD']
+        request_headers = decode_headers(environ_headers(environ))
+        if request_method == 'OPTIONS':
+            headers = response_headers({'Allow': OPTIONS_ALLOW}, request_headers)
+            return send_response(start_response, request_method, 200, headers, b'')
+        try:
+            request = self.build_request(
+                method=request_method,
+                url=request_uri(environ),
+                headers=request_headers,
+                query_string=environ.get('QUERY_STRING', '').encode('latin-1'),
+                body=read_body(environ),
+                view_args=view_args,
+            )
+            url = request.url
+            method = request.method
+            response, serialized_body = self.dispatcher.dispatch(request)
+            status, headers = response.status_code, response.headers
+        except errors.HttpErrorBase as e:
+            status, headers, serialized_body = self.handle_http_exception(e, request)
+        except Exception as e:
+            status, headers, serialized_body = self.handle_general_exception(
+                e, request, url, method)
+        return send_response(start_response,
+                             request_method,
+                             status,
+                             response_headers(headers, request_headers),
+                             serialized_body)
+
+
+def read_body(environ):
+    try:
+        length = int(environ.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        length = 0
+    return environ['wsgi.input'].read(length) if length > 0 else b''
+
+
+def send_response(start_response, method, status, headers, body):
+    """
+    Starts the response and returns its body as an iterable of bytes, either
+    a single chunk or the chunks of a streamed response.
+    """
+    body = prepare_body(method, status, headers, body)
+    start_response(status_line(status), headers)
+    return [body] if isinstance(body, bytes) else body
+
+
+def environ_headers(environ):
+    for key, value in environ.items():
+        if key.startswith('HTTP_'):
+            yield key[5:].replace('_', '-'), value
+    if environ.get('CONTENT_TYPE'):
+        yield 'Content-Type', environ['CONTENT_TYPE']
@@ -5,14 +5,27 @@ import datetime
 import uuid
 import json
 import re
+from functools import lru_cache
 
 import jsonschema
 import arrow
 
-from . import errors, NotSet
+from . import errors
+from .datastructures import NotSet
+
+# the forms date.fromisoformat and datetime.fromisoformat parse the same way
+# as arrow on every python version from 3.7, which is much stricter than 3.11
+ISO_DATE = re.compile(r'\d{4}-\d{2}-\d{2}')
+ISO_DATETIME = re.compile(
+    r'\d{4}-\d{2}-\d{2}'
+    r'(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{3}(?:\d{3})?)?)?(?:[+-]\d{2}:\d{2})?)?'
+)
 
 
 class FieldValidator(object):
+    # The maximum size of the LRU cache of string conversions, shared by every
+    # field of the validator type. 0 disables the cache, see set_cast_cache.
+    cast_cache_size = 0
 
     def __init__(self, field):
         self._field = field
@@ -20,7 +33,7 @@ class FieldValidator(object):
     def validate(self, value, cast=False):
 
         # NotSet is valid
-        if value == NotSet:
+        if value is NotSet:
             return NotSet
 
         # If value is None check whether field is nullable, if so raise an exception, if not return None
@@ -37,6 +50,47 @@ class FieldValidator(object):
 
         return value
 
+    def compile(self, cast=False):
+        """
+        Returns a single argument function equivalent to
+        ``validate(value, cast)`` with the field flags and the validation
+        steps resolved once. Used to build :class:`.Resource` validation plans.
+        """
+        if type(self).validate is not FieldValidator.validate:
+            return lambda value: self.validate(value, cast)
+
+        field = self._field
+        notnull = field.flags['notnull']
+        valid = self.valid
+        attempt_cast = self.attempt_cast
+        raise_validation_error = self.raise_validation_error
+        additional_validation = None
+        if type(self).additional_validation is not FieldValidator.additional_validation:
+            additional_validation = self.additional_validation
+        validate_options = self._validate_options if field.flags['options'] else None
+
+        def compiled_validate(value):
+            if value is NotSet:
+                return NotSet
+            if value is None:
+                if notnull:
+                    raise errors.ValidationError('{0} cannot be null'.format(field))
+                return None
+            if not valid(value):
+                if not cast:
+                    raise_validation_error(value)
+                try:
+                    value = attempt_cast(value)
+                except (ValueError, TypeError):
+                    raise_validation_error(value)
+            if additional_validation is not None:
+                additional_validation(value)
+            if validate_options is not None:
+                validate_options(value)
+            return value
+
+        return compiled_validate
+
     def valid(self, value):
         raise NotImplementedError()
 
@@ -49,6 +103,23 @@ class FieldValidator(object):
     def additional_validation(self, value):
         pass
 
+    @classmethod
+    def set_cast_cache(cls, maxsize):
+        """
+        Enables a bounded LRU cache of string conversions for every field of
+        this validator type, or disables it when ``maxsize`` is 0. Only
+        validators which cast strings to immutable values support a cache.
+
+        :param maxsize: The maximum number of conversions to keep
+        """
+        if not hasattr(cls, 'convert_str'):
+            raise TypeError('{0} does not support a cast cache'.format(cls.__name__))
+        cls.cast_cache_size = maxsize
+        if maxsize:
+            cls._convert_str = staticmethod(lru_cache(maxsize=maxsize)(cls.convert_str))
+        else:
+            cls._convert_str = staticmethod(cls.convert_str)
+
     def _type_validation(self, value, cast):
         if not self.valid(value):
             if cast:
@@ -127,9 +198,19 @@ class DateValidator(FieldValidator):
     def valid(self, value):
         return isinstance(value, datetime.date)
 
+    @staticmethod
+    def convert_str(value):
+        # date.fromisoformat is much faster than strptime but more lenient,
+        # only use it for the canonical form
+        if ISO_DATE.fullmatch(value):
+            return datetime.date.fromisoformat(value)
+        return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+
+    _convert_str = convert_str
+
     def attempt_cast(self, value):
         if isinstance(value, str):
-            return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+            return self._convert_str(value)
         elif isinstance(value, numbers.Integral) and not isinstance(value, bool):
             return datetime.datetime.utcfromtimestamp(value).date()
         else:
@@ -146,10 +227,24 @@ class DateTimeValidator(FieldValidator):
     def valid(self, value):
         return isinstance(value, datetime.datetime)
 
+    @staticmethod
+    def convert_str(value):
+        # datetime.fromisoformat is much faster than arrow, which is left to
+        # parse every other form, such as Z offsets, basic formats and
+        # fractions beyond microseconds, which it rounds rather than truncates
+        if ISO_DATETIME.fullmatch(value):
+            try:
+                return datetime.datetime.fromisoformat(value).replace(tzinfo=None)
+            except ValueError:
+                pass
+        return arrow.get(value).datetime.replace(tzinfo=None)
+
+    _convert_str = convert_str
+
     def attempt_cast(self, value):
         if isinstance(value, str):
             try:
-                return arrow.get(value).datetime.replace(tzinfo=None)
+                return self._convert_str(value)
             except arrow.parser.ParserError as e:
                 raise errors.ValidationError(
                     'Field {0}: {1}'.format(self._field, e)
@@ -198,9 +293,15 @@ class UUIDValidator(FieldValidator):
     def valid(self, value):
         return isinstance(value, uuid.UUID)
 
+    @staticmethod
+    def convert_str(value):
+        return uuid.UUID(value)
+
+    _convert_str = convert_str
+
     def attempt_cast(self, value):
         if isinstance(value, str):
-            return uuid.UUID(value)
+            return self._convert_str(value)
         elif isinstance(value, bytes):
             return uuid.UUID(bytes=value)
         else: